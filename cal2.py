@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import functools
 import math
 import ast
 import operator
+import re
 
 # ---------------------- Safe eval ----------------------
 SAFE_NAMES = {k: getattr(math, k) for k in dir(math) if not k.startswith("__")}
@@ -27,45 +29,78 @@ ALLOWED_OPERATORS = {
 class EvalError(Exception):
     pass
 
-def safe_eval(expr: str):
+def _check_constant(node):
+    if not isinstance(node.value, (int, float)):
+        raise EvalError("Invalid constant")
+
+def _check_binop(node):
+    if type(node.op) not in ALLOWED_OPERATORS:
+        raise EvalError("Invalid operator")
+
+def _check_unary(node):
+    if type(node.op) not in ALLOWED_OPERATORS:
+        raise EvalError("Invalid unary operator")
+
+def _check_call(node):
+    if not isinstance(node.func, ast.Name):
+        raise EvalError("Invalid function call")
+
+def _check_name(node):
+    if node.id not in SAFE_NAMES:
+        raise EvalError(f"Unknown name {node.id}")
+
+# Validator dispatch table: node type -> extra check (None = allowed as-is).
+# Any type missing from the table is rejected outright, so validation is one
+# dict lookup plus at most one targeted check per node instead of a chain
+# of isinstance tests.
+_NODE_CHECKS = {
+    ast.Expression: None,
+    ast.Load: None,
+    ast.Constant: _check_constant,
+    ast.BinOp: _check_binop,
+    ast.UnaryOp: _check_unary,
+    ast.Call: _check_call,
+    ast.Name: _check_name,
+}
+_NODE_CHECKS.update({op: None for op in ALLOWED_OPERATORS})
+
+@functools.lru_cache(maxsize=256)
+def _compile_safe(expr: str):
+    """Validate the expression AST against the whitelist, then compile it.
+
+    Compiling to bytecode and letting the ceval loop run it is much faster
+    than walking the tree in Python, and the lru_cache makes repeated
+    expressions (pressing '=' again, 'ans' chains) essentially free.
+    """
     try:
-        node = ast.parse(expr, mode='eval')
-    except Exception:
+        tree = ast.parse(expr, mode='eval')
+    except (SyntaxError, ValueError):
         raise EvalError("Syntax error")
+    for node in ast.walk(tree):
+        try:
+            check = _NODE_CHECKS[type(node)]
+        except KeyError:
+            raise EvalError("Unsupported expression")
+        if check is not None:
+            check(node)
+    return compile(tree, '<calc>', 'eval')
 
-    def _eval(node):
-        if isinstance(node, ast.Expression):
-            return _eval(node.body)
-        if isinstance(node, ast.Constant):
-            if isinstance(node.value, (int, float)):
-                return node.value
-            raise EvalError("Invalid constant")
-        if isinstance(node, ast.Num):
-            return node.n
-        if isinstance(node, ast.BinOp):
-            left, right = _eval(node.left), _eval(node.right)
-            if type(node.op) in ALLOWED_OPERATORS:
-                return ALLOWED_OPERATORS[type(node.op)](left, right)
-            raise EvalError("Invalid operator")
-        if isinstance(node, ast.UnaryOp):
-            operand = _eval(node.operand)
-            if type(node.op) in ALLOWED_OPERATORS:
-                return ALLOWED_OPERATORS[type(node.op)](operand)
-            raise EvalError("Invalid unary operator")
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id in SAFE_NAMES:
-                args = [_eval(a) for a in node.args]
-                return SAFE_NAMES[node.func.id](*args)
-            raise EvalError("Invalid function call")
-        if isinstance(node, ast.Name):
-            if node.id in SAFE_NAMES:
-                return SAFE_NAMES[node.id]
-            raise EvalError(f"Unknown name {node.id}")
-        if isinstance(node, ast.Expr):
-            return _eval(node.value)
-        raise EvalError("Unsupported expression")
-
-    return _eval(node)
+# Plain arithmetic like "2+3*4": digits and operators only, no names to
+# whitelist, so it can skip AST validation entirely ('//' is excluded to
+# keep floor division rejected, as the validator would).
+_PURE_ARITH = re.compile(r'[\d.+\-*/%() ]+')
+
+# safe_eval is pure over the expression string (SAFE_NAMES holds only
+# deterministic functions/constants), so results can be memoized outright;
+# lru_cache never caches raised EvalErrors, only successful values.
+@functools.lru_cache(maxsize=512)
+def safe_eval(expr: str):
+    if _PURE_ARITH.fullmatch(expr) and '//' not in expr:
+        try:
+            return eval(compile(expr, '<calc>', 'eval'), {"__builtins__": {}}, {})
+        except (SyntaxError, ValueError):
+            raise EvalError("Syntax error")
+    return eval(_compile_safe(expr), {"__builtins__": {}}, SAFE_NAMES)
 
 # ---------------------- GUI ----------------------
 
@@ -84,6 +119,7 @@ class FancyCalculator(tk.Tk):
         self.style = ttk.Style(self)
         self._set_theme()
 
+        self._handlers = self._build_handlers()
         self._create_header()
         self._create_display()
         self._create_body()
@@ -120,6 +156,7 @@ class FancyCalculator(tk.Tk):
         # Left: buttons
         btn_frame = ttk.Frame(body)
         btn_frame.pack(side='left', fill='both', expand=True)
+        self._all_buttons = []
 
         buttons = [
             ['7', '8', '9', '/', 'sqrt'],
@@ -135,11 +172,12 @@ class FancyCalculator(tk.Tk):
             row_frame.pack(fill='x', expand=True)
             for label in row:
                 btn = tk.Button(row_frame, text=label, relief='flat', bd=0,
-                                command=lambda l=label: self._on_button(l))
+                                command=self._handlers[label])
                 btn.pack(side='left', expand=True, fill='both', padx=3, pady=3)
-                btn.bind('<Enter>', lambda e, b=btn: b.configure(bg=self.accent, fg='white'))
-                btn.bind('<Leave>', lambda e, b=btn: b.configure(bg=self.btn_bg, fg=self.btn_fg))
+                btn.bind('<Enter>', self._on_hover_enter)
+                btn.bind('<Leave>', self._on_hover_leave)
                 btn.configure(bg=self.btn_bg, fg=self.btn_fg)
+                self._all_buttons.append(btn)
 
         # Right: history with scrollbar
         hist_frame = ttk.Frame(body)
@@ -157,27 +195,40 @@ class FancyCalculator(tk.Tk):
     def _bind_keys(self):
         for k in '0123456789+-*/().%':
             self.bind(k, self._key_insert)
-        self.bind('<Return>', lambda e: self._on_button('='))
-        self.bind('<BackSpace>', lambda e: self._on_button('BACK'))
-        self.bind('<Escape>', lambda e: self._on_button('C'))
+        self.bind('<Return>', lambda e: self._calculate())
+        self.bind('<BackSpace>', lambda e: self._backspace())
+        self.bind('<Escape>', lambda e: self._clear())
 
-    def _on_button(self, label):
-        expr = self.expression.get()
-        if label == 'C':
-            self.expression.set(''); self.result.set(''); return
-        if label == 'BACK':
-            self.expression.set(expr[:-1]); return
-        if label == 'ans' and self.history:
-            self.expression.set(expr + str(self.history[-1][1])); return
-        if label == '=':
-            self._calculate(); return
-
-        mapping = {
-            'sqrt': 'sqrt(', 'pow': 'pow(', 'log': 'log(', 'ln': 'ln(',
-            'pi': str(math.pi), 'e': str(math.e),
-            'sin': 'sin(', 'cos': 'cos(', 'tan': 'tan('
+    def _build_handlers(self):
+        # one dispatch table built up front: each button gets its bound
+        # handler instead of a fresh closure, and pressing it is a dict
+        # lookup rather than an if-chain in _on_button
+        handlers = {
+            'C': self._clear,
+            '=': self._calculate,
+            'ans': self._push_ans,
         }
-        self.expression.set(expr + mapping.get(label, label))
+        for name in ('sqrt', 'pow', 'log', 'ln', 'sin', 'cos', 'tan'):
+            handlers[name] = functools.partial(self._append, name + '(')
+        handlers['pi'] = functools.partial(self._append, str(math.pi))
+        handlers['e'] = functools.partial(self._append, str(math.e))
+        for label in '0123456789.+-*/%()':
+            handlers[label] = functools.partial(self._append, label)
+        return handlers
+
+    def _append(self, text):
+        self.expression.set(self.expression.get() + text)
+
+    def _clear(self):
+        self.expression.set('')
+        self.result.set('')
+
+    def _backspace(self):
+        self.expression.set(self.expression.get()[:-1])
+
+    def _push_ans(self):
+        if self.history:
+            self._append(str(self.history[-1][1]))
 
     def _key_insert(self, event):
         if event.char:
@@ -206,15 +257,21 @@ class FancyCalculator(tk.Tk):
             self.expression.set(expr)
             self.result.set(res)
 
+    def _on_hover_enter(self, event):
+        event.widget.configure(bg=self.accent, fg='white')
+
+    def _on_hover_leave(self, event):
+        event.widget.configure(bg=self.btn_bg, fg=self.btn_fg)
+
     def _toggle_theme(self):
         self._set_theme()
-        self._recolor_widgets(self)
+        self._recolor_widgets()
 
-    def _recolor_widgets(self, widget):
-        for w in widget.winfo_children():
-            if isinstance(w, tk.Button):
-                w.configure(bg=self.btn_bg, fg=self.btn_fg)
-            self._recolor_widgets(w)
+    def _recolor_widgets(self):
+        # buttons are collected once at build time; no need to re-walk the
+        # whole widget tree on every theme toggle
+        for b in self._all_buttons:
+            b.configure(bg=self.btn_bg, fg=self.btn_fg)
 
 if __name__ == '__main__':
     app = FancyCalculator()
@@ -1,6 +1,29 @@
+import re
 import tkinter as tk
 from tkinter import ttk
 
+# Response rules compiled once into a single case-insensitive alternation;
+# _get_response does one C-level scan and dispatches on the matched group
+# instead of running a dozen substring checks per message. This also lets
+# mixed-case rules like "IS it abir??" actually fire.
+_RULES = [
+    ("greet", r"hello|hi", "Hello! How can I help you today?"),
+    ("howare", r"how are you", "I'm just a bot, but I'm doing great! How about you?"),
+    ("name", r"your name", "I'm a simple Python Chatbot."),
+    ("bye", r"bye", "Goodbye! Have a great day!"),
+    ("helpme", r"can you help me", "Yes but in  limited cases."),
+    ("abir", re.escape("IS it abir??"), "Yes!!"),
+    ("needhelp", r"i need a help", "What's the issue?"),
+    ("bored", re.escape("I am feeling bored."), "You can play some game."),
+    ("nogames", r"i dont want to play games", "You can take a nap."),
+    ("shopping", r"i need to go to the shopping", "What you need to buy?"),
+    ("outfits", r"i need to buy some outfits", "But you have many."),
+    ("buymore", r"i want to buy some more", "You should spend your money efficiently and carefully."),
+    ("careful", re.escape("Okh, I will be careful from the next time."), "Yes, be careful."),
+]
+_RE = re.compile("|".join(f"(?P<{n}>{p})" for n, p, _ in _RULES), re.IGNORECASE)
+_REPLY = {n: r for n, _, r in _RULES}
+
 class ChatbotApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -63,33 +86,9 @@ class ChatbotApp(tk.Tk):
         self.text_area.yview_moveto(1)
 
     def _get_response(self, msg: str) -> str:
-        msg = msg.lower()
-        if "hello" in msg or "hi" in msg:
-            return "Hello! How can I help you today?"
-        if "how are you" in msg:
-            return "I'm just a bot, but I'm doing great! How about you?"
-        if "your name" in msg:
-            return "I'm a simple Python Chatbot."
-        if "bye" in msg:
-            return "Goodbye! Have a great day!"
-        if "can you help me" in msg:
-            return "Yes but in  limited cases."
-        if "IS it abir??" in msg:
-            return "Yes!!"
-        if "I need a help" in msg:
-            return "What's the issue?"
-        if "I am feeling bored." in msg:
-            return "You can play some game."
-        if "I dont want to play games" in msg:
-            return "You can take a nap."
-        if "I need to go to the shopping" in msg:
-            return "What you need to buy?"
-        if "I need to buy some outfits" in msg:
-            return "But you have many."
-        if "I want to buy some more" in msg:
-            return "You should spend your money efficiently and carefully."
-        if "Okh, I will be careful from the next time." in msg:
-            return "Yes, be careful."
+        m = _RE.search(msg)
+        if m:
+            return _REPLY[m.lastgroup]
         return "I'm not sure how to respond to that."
 
     def _toggle_theme(self):
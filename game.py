@@ -16,14 +16,18 @@ Features:
 This file is intentionally one file to make it easy to run and iterate on.
 """
 
+import collections
 import math
 import random
 import sys
 from dataclasses import dataclass
 
+import numpy as np
 import pygame
 from pygame import Vector2
 
+import game_kernels
+
 # --------- CONFIG ---------
 SCREEN_SIZE = (1200, 700)
 FPS = 60
@@ -31,6 +35,13 @@ PLAYER_SPEED = 320
 BULLET_SPEED = 900
 ENEMY_SPEED = 140
 SPAWN_PADDING = 50
+CHASE_RANGE2 = 260 * 260
+PATROL_RANGE2 = 360 * 360
+BULLET_RADIUS = 4
+BULLET_LIFE = 2.2
+MAX_PARTICLES = 4096
+MAX_BULLETS = 512
+CELL = 48  # spatial hash cell size; >= largest collision radius sum
 
 # Colors
 WHITE = (245, 245, 245)
@@ -50,54 +61,36 @@ def angle_to(v: Vector2):
     return math.degrees(math.atan2(-v.y, v.x))
 
 
-# --------- PARTICLES ---------
-class Particle:
-    def __init__(self, pos, vel, life, size, color):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(vel)
-        self.life = life
-        self.max_life = life
-        self.size = size
-        self.color = color
-
-    def update(self, dt):
-        self.life -= dt
-        self.pos += self.vel * dt
-        # gravity-like
-        self.vel *= 0.98
+# Cheap xorshift32 RNG + a 256-entry unit-direction LUT for enemy wander:
+# a retarget costs two shifts/xors and a table load instead of Mersenne
+# Twister state updates plus cos/sin.
+_DIRS = np.array([[math.cos(a), math.sin(a)]
+                  for a in np.linspace(0, 2 * math.pi, 256, endpoint=False)],
+                 dtype=np.float32)
+_xorshift_state = 2463534242
 
-    def draw(self, surf):
-        if self.life <= 0:
-            return
-        a = clamp(self.life / self.max_life, 0, 1)
-        s = int(self.size * (0.6 + 0.4 * a))
-        surf_rect = pygame.Rect(0, 0, s, s)
-        surf_rect.center = self.pos
-        col = tuple(int(c * (0.4 + 0.6 * a)) for c in self.color)
-        pygame.draw.ellipse(surf, col, surf_rect)
 
+def _xorshift():
+    global _xorshift_state
+    x = _xorshift_state
+    x ^= (x << 13) & 0xFFFFFFFF
+    x ^= x >> 17
+    x ^= (x << 5) & 0xFFFFFFFF
+    _xorshift_state = x
+    return x
 
-# --------- ENTITIES ---------
-class Bullet:
-    def __init__(self, pos, vel, owner):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(vel)
-        self.owner = owner
-        self.life = 2.2
-        self.radius = 4
 
-    def update(self, dt):
-        self.life -= dt
-        self.pos += self.vel * dt
-
-    def draw(self, surf):
-        if self.life <= 0:
-            return
-        end = self.pos - self.vel.normalize() * 6
-        pygame.draw.line(surf, YELLOW, tuple(self.pos), tuple(end), 2)
-        pygame.draw.circle(surf, YELLOW, (int(self.pos.x), int(self.pos.y)), self.radius)
+# (cos, sin) rotation tables for shooting: ±6° spread in 1° steps and
+# ±40° muzzle-flash scatter in 2° steps — a table load per shot instead
+# of math.radians + sin/cos (and Vector2.rotate's trig per particle)
+_SPREAD_LUT = [(math.cos(math.radians(d)), math.sin(math.radians(d))) for d in range(-6, 7)]
+_MUZZLE_LUT = [(math.cos(math.radians(d)), math.sin(math.radians(d))) for d in range(-40, 41, 2)]
 
 
+# --------- ENTITIES ---------
+# Particles and bullets live in SoA (structure-of-arrays) NumPy buffers owned
+# by Game: parallel float32 arrays for position/velocity/lifetime updated in
+# whole-array ops instead of per-object Python loops. See Game.__init__.
 class Player:
     def __init__(self, pos):
         self.pos = Vector2(pos)
@@ -134,24 +127,27 @@ class Player:
         if self.dash_timer > 0:
             self.dash_timer -= dt
 
-    def shoot(self, target, bullets, particles):
+    def shoot(self, target, game):
         if self.reload > 0:
             return
         direction = Vector2(target) - self.pos
         if direction.length_squared() == 0:
             direction = Vector2(1, 0)
         direction = direction.normalize()
-        spread = random.uniform(-6, 6)
-        rad = math.radians(spread)
-        dir_rot = Vector2(direction.x * math.cos(rad) - direction.y * math.sin(rad),
-                          direction.x * math.sin(rad) + direction.y * math.cos(rad))
-        speed = BULLET_SPEED
-        bullets.append(Bullet(self.pos + dir_rot * (self.radius + 6), dir_rot * speed, owner=self))
+        dx, dy = direction.x, direction.y
+        c, s = _SPREAD_LUT[random.randint(0, len(_SPREAD_LUT) - 1)]
+        rx = dx * c - dy * s
+        ry = dx * s + dy * c
+        mx = self.pos.x + rx * (self.radius + 6)
+        my = self.pos.y + ry * (self.radius + 6)
+        game.emit_bullet((mx, my), (rx * BULLET_SPEED, ry * BULLET_SPEED))
         self.reload = self.fire_rate
         # muzzle particle
         for _ in range(8):
-            vel = dir_rot.rotate(random.uniform(-40, 40)) * random.uniform(80, 420)
-            particles.append(Particle(self.pos + dir_rot * (self.radius + 6), vel, random.uniform(0.25, 0.6), random.uniform(2, 5), YELLOW))
+            c, s = _MUZZLE_LUT[random.randint(0, len(_MUZZLE_LUT) - 1)]
+            speed = random.uniform(80, 420)
+            vel = ((rx * c - ry * s) * speed, (rx * s + ry * c) * speed)
+            game.emit_particle((mx, my), vel, random.uniform(0.25, 0.6), random.uniform(2, 5), YELLOW)
 
     def draw(self, surf, mouse_pos):
         # shadow
@@ -167,48 +163,59 @@ class Player:
 
 
 class Enemy:
+    # hot-path state is raw floats (px/py/vx/vy): every Vector2 operator in
+    # the per-frame loops would allocate a fresh object
     def __init__(self, pos, kind=0):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(0, 0)
+        self.px = float(pos[0])
+        self.py = float(pos[1])
+        self.vx = 0.0
+        self.vy = 0.0
         self.kind = kind
         self.radius = 14 if kind == 0 else 22
         self.health = 30 if kind == 0 else 90
         self.max_health = self.health
         self.state = "patrol"
         self.target = None
-        self.wander_dir = Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
-        self.change_timer = random.uniform(1.0, 3.0)
-
-    def update(self, dt, player_pos):
-        # simple state machine: patrol -> chase
-        dist = (player_pos - self.pos).length()
-        if dist < 260:
+        self.wdx, self.wdy = _DIRS[_xorshift() & 255]
+        self.change_timer = 1.0 + (_xorshift() & 0xFFFF) * (2.0 / 65535.0)
+
+    def update(self, dt, player_x, player_y):
+        # simple state machine: patrol -> chase (squared distances, no sqrt
+        # unless we actually need to normalize the chase direction)
+        dx = player_x - self.px
+        dy = player_y - self.py
+        d2 = dx * dx + dy * dy
+        if d2 < CHASE_RANGE2:
             self.state = "chase"
-        elif dist > 360:
+        elif d2 > PATROL_RANGE2:
             self.state = "patrol"
 
-        if self.state == "chase":
-            desired = (player_pos - self.pos).normalize() * ENEMY_SPEED
+        if self.state == "chase" and d2 > 0:
+            inv = ENEMY_SPEED / math.sqrt(d2)
+            desired_x = dx * inv
+            desired_y = dy * inv
         else:
             self.change_timer -= dt
             if self.change_timer <= 0:
-                self.wander_dir = Vector2(random.uniform(-1, 1), random.uniform(-1, 1))
-                if self.wander_dir.length_squared() > 0:
-                    self.wander_dir = self.wander_dir.normalize()
-                self.change_timer = random.uniform(1.0, 3.0)
-            desired = self.wander_dir * (ENEMY_SPEED * 0.6)
+                self.wdx, self.wdy = _DIRS[_xorshift() & 255]
+                self.change_timer = 1.0 + (_xorshift() & 0xFFFF) * (2.0 / 65535.0)
+            desired_x = self.wdx * (ENEMY_SPEED * 0.6)
+            desired_y = self.wdy * (ENEMY_SPEED * 0.6)
 
-        self.vel += (desired - self.vel) * clamp(6 * dt, 0, 1)
-        self.pos += self.vel * dt
+        k = clamp(6 * dt, 0, 1)
+        self.vx += (desired_x - self.vx) * k
+        self.vy += (desired_y - self.vy) * k
+        self.px += self.vx * dt
+        self.py += self.vy * dt
 
     def draw(self, surf):
         col = (200, 80, 80) if self.kind == 0 else (180, 90, 200)
-        pygame.draw.circle(surf, col, (int(self.pos.x), int(self.pos.y)), self.radius)
+        pygame.draw.circle(surf, col, (int(self.px), int(self.py)), self.radius)
         # health
         hpw = int(self.radius * 2 * (self.health / max(1, self.max_health)))
         if hpw > 0:
             rect = pygame.Rect(0, 0, hpw, 4)
-            rect.midtop = (self.pos.x, self.pos.y - self.radius - 8)
+            rect.midtop = (self.px, self.py - self.radius - 8)
             pygame.draw.rect(surf, GREEN, rect)
 
 
@@ -221,35 +228,155 @@ class Game:
         self.clock = pygame.time.Clock()
         self.dt = 0
         self.player = Player(Vector2(SCREEN_SIZE[0] / 2, SCREEN_SIZE[1] / 2))
-        self.bullets = []
         self.enemies = []
-        self.particles = []
+        # SoA particle pool: parallel float32 arrays, p_count live entries
+        self.p_pos = np.zeros((MAX_PARTICLES, 2), np.float32)
+        self.p_vel = np.zeros((MAX_PARTICLES, 2), np.float32)
+        self.p_life = np.zeros(MAX_PARTICLES, np.float32)
+        self.p_maxlife = np.ones(MAX_PARTICLES, np.float32)
+        self.p_size = np.zeros(MAX_PARTICLES, np.float32)
+        self.p_color = np.zeros((MAX_PARTICLES, 3), np.uint8)
+        self.p_count = 0
+        # SoA bullet pool
+        self.b_pos = np.zeros((MAX_BULLETS, 2), np.float32)
+        self.b_vel = np.zeros((MAX_BULLETS, 2), np.float32)
+        self.b_life = np.zeros(MAX_BULLETS, np.float32)
+        self.b_count = 0
+        self.grid = collections.defaultdict(list)
+        game_kernels.warmup()
         self.spawn_timer = 0
         self.wave = 1
         self.running = True
         self.paused = False
         self.state = "menu"  # menu, playing, gameover
         self.menu_sel = 0
-        self.font = pygame.font.SysFont("Segoe UI", 20)
+        self._font_cache = {}
+        self._text_cache = {}
+        self.font = self._get_font(20)
+        self._bg = self._make_background()
+        # lazily-filled atlas of particle sprites keyed by
+        # (color, size bucket, alpha bucket); bounded by the few colors,
+        # 5 size buckets and 16 alpha steps in play
+        self._part_atlas = {}
+
+    def _get_font(self, size, bold=False):
+        """SysFont construction is expensive; build each (size, bold) once."""
+        f = self._font_cache.get((size, bold))
+        if f is None:
+            f = pygame.font.SysFont("Segoe UI", size, bold=bold)
+            self._font_cache[(size, bold)] = f
+        return f
+
+    def _render_text(self, text, color, size=20, bold=False):
+        """Memoized font.render — HUD strings only re-rasterize on change."""
+        key = (text, color, size, bold)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 256:
+                self._text_cache.clear()
+            surf = self._get_font(size, bold).render(text, True, color).convert_alpha()
+            self._text_cache[key] = surf
+        return surf
+
+    def _particle_sprite(self, color_bytes, size, alpha_bucket):
+        key = (color_bytes, size, alpha_bucket)
+        surf = self._part_atlas.get(key)
+        if surf is None:
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            # color_bytes is the particle's uint8 RGB row; tuple() of bytes
+            # yields the int triple pygame expects
+            pygame.draw.ellipse(surf, tuple(color_bytes), surf.get_rect())
+            surf.set_alpha(alpha_bucket * 17)
+            self._part_atlas[key] = surf
+        return surf
+
+    def _make_background(self):
+        """Rasterize the static background (fill + grid lines) once; draw()
+        just blits it instead of re-issuing ~40 line calls every frame."""
+        bg = pygame.Surface(SCREEN_SIZE).convert()
+        bg.fill((18, 18, 20))
+        gstep = 48
+        for x in range(0, SCREEN_SIZE[0], gstep):
+            pygame.draw.line(bg, (18, 18, 26), (x, 0), (x, SCREEN_SIZE[1]))
+        for y in range(0, SCREEN_SIZE[1], gstep):
+            pygame.draw.line(bg, (18, 18, 26), (0, y), (SCREEN_SIZE[0], y))
+        return bg
+
+    def emit_particle(self, pos, vel, life, size, color):
+        i = self.p_count
+        if i >= MAX_PARTICLES:
+            return
+        self.p_pos[i] = (pos[0], pos[1])
+        self.p_vel[i] = (vel[0], vel[1])
+        self.p_life[i] = life
+        self.p_maxlife[i] = life
+        self.p_size[i] = size
+        self.p_color[i] = color
+        self.p_count = i + 1
+
+    def emit_burst(self, x, y, count, speed_lo, speed_hi, life_lo, life_hi,
+                   size_lo, size_hi, colors):
+        """Write a whole particle burst into the pool in one vectorized shot
+        instead of `count` emit_particle calls. `colors` is a single RGB
+        tuple or a sequence to pick randomly per particle."""
+        i = self.p_count
+        k = min(count, MAX_PARTICLES - i)
+        if k <= 0:
+            return
+        j = i + k
+        self.p_pos[i:j] = (x, y)
+        dirs = np.random.uniform(-1.0, 1.0, (k, 2)).astype(np.float32)
+        self.p_vel[i:j] = dirs * np.random.uniform(speed_lo, speed_hi, (k, 1)).astype(np.float32)
+        life = np.random.uniform(life_lo, life_hi, k).astype(np.float32)
+        self.p_life[i:j] = life
+        self.p_maxlife[i:j] = life
+        self.p_size[i:j] = np.random.uniform(size_lo, size_hi, k)
+        cols = np.asarray(colors, np.uint8)
+        if cols.ndim == 1:
+            self.p_color[i:j] = cols
+        else:
+            self.p_color[i:j] = cols[np.random.randint(0, len(cols), k)]
+        self.p_count = j
+
+    def emit_bullet(self, pos, vel):
+        i = self.b_count
+        if i >= MAX_BULLETS:
+            return
+        self.b_pos[i] = (pos[0], pos[1])
+        self.b_vel[i] = (vel[0], vel[1])
+        self.b_life[i] = BULLET_LIFE
+        self.b_count = i + 1
 
     def spawn_enemy(self):
         side = random.choice(["left", "right", "top", "bottom"])
         if side == "left":
-            pos = Vector2(-SPAWN_PADDING, random.uniform(0, SCREEN_SIZE[1]))
+            pos = (-SPAWN_PADDING, random.uniform(0, SCREEN_SIZE[1]))
         elif side == "right":
-            pos = Vector2(SCREEN_SIZE[0] + SPAWN_PADDING, random.uniform(0, SCREEN_SIZE[1]))
+            pos = (SCREEN_SIZE[0] + SPAWN_PADDING, random.uniform(0, SCREEN_SIZE[1]))
         elif side == "top":
-            pos = Vector2(random.uniform(0, SCREEN_SIZE[0]), -SPAWN_PADDING)
+            pos = (random.uniform(0, SCREEN_SIZE[0]), -SPAWN_PADDING)
         else:
-            pos = Vector2(random.uniform(0, SCREEN_SIZE[0]), SCREEN_SIZE[1] + SPAWN_PADDING)
+            pos = (random.uniform(0, SCREEN_SIZE[0]), SCREEN_SIZE[1] + SPAWN_PADDING)
         kind = 0 if random.random() < 0.82 else 1
         self.enemies.append(Enemy(pos, kind))
 
+    def _hit_enemy_near(self, grid, cx, cy, x, y, radius):
+        """Return the first enemy within `radius` of (x, y), scanning the
+        3x3 cell block around (cx, cy), or None."""
+        for gx in range(cx - 1, cx + 2):
+            for gy in range(cy - 1, cy + 2):
+                for ei in grid.get((gx, gy), ()):
+                    e = self.enemies[ei]
+                    dx = x - e.px
+                    dy = y - e.py
+                    rsum = e.radius + radius
+                    if dx * dx + dy * dy < rsum * rsum:
+                        return e
+        return None
+
     def world_bounds(self, ent):
-        x = clamp(ent.pos.x, -40, SCREEN_SIZE[0] + 40)
-        y = clamp(ent.pos.y, -40, SCREEN_SIZE[1] + 40)
-        ent.pos.x = x
-        ent.pos.y = y
+        ent.px = clamp(ent.px, -40, SCREEN_SIZE[0] + 40)
+        ent.py = clamp(ent.py, -40, SCREEN_SIZE[1] + 40)
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -267,14 +394,14 @@ class Game:
                     self.start_game()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and self.state == "playing" and not self.paused:
-                    self.player.shoot(pygame.mouse.get_pos(), self.bullets, self.particles)
+                    self.player.shoot(pygame.mouse.get_pos(), self)
 
     def start_game(self):
         self.state = "playing"
         self.player = Player(Vector2(SCREEN_SIZE[0] / 2, SCREEN_SIZE[1] / 2))
-        self.bullets = []
         self.enemies = []
-        self.particles = []
+        self.p_count = 0
+        self.b_count = 0
         self.wave = 1
         self.spawn_timer = 0
         self.player.score = 0
@@ -292,43 +419,7 @@ class Game:
                     self.spawn_enemy()
                 self.spawn_timer = 6.0
                 self.wave += 1
-            # update bullets
-            for b in list(self.bullets):
-                b.update(self.dt)
-                if b.life <= 0:
-                    self.bullets.remove(b)
-            # update enemies
-            for e in list(self.enemies):
-                e.update(self.dt, self.player.pos)
-                self.world_bounds(e)
-                # collisions with bullets
-                for b in list(self.bullets):
-                    if (b.pos - e.pos).length() < e.radius + b.radius:
-                        e.health -= 20 * self.player.upgrades.get("damage", 1.0)
-                        try:
-                            self.bullets.remove(b)
-                        except ValueError:
-                            pass
-                        # hit particles
-                        for _ in range(10):
-                            vel = Vector2(random.uniform(-1, 1), random.uniform(-1, 1)) * random.uniform(40, 260)
-                            self.particles.append(Particle(e.pos, vel, random.uniform(0.3, 0.9), random.uniform(2, 5), RED))
-                if e.health <= 0:
-                    self.enemies.remove(e)
-                    self.player.score += 10 if e.kind == 0 else 35
-                    # explosion particles
-                    for _ in range(25):
-                        vel = Vector2(random.uniform(-1, 1), random.uniform(-1, 1)) * random.uniform(40, 480)
-                        self.particles.append(Particle(e.pos, vel, random.uniform(0.6, 1.2), random.uniform(3, 8), random.choice([RED, YELLOW, GREEN])))
-            # player collision with enemies
-            for e in self.enemies:
-                if (self.player.pos - e.pos).length() < self.player.radius + e.radius:
-                    self.player.health -= 30 * self.dt
-            # update particles
-            for p in list(self.particles):
-                p.update(self.dt)
-                if p.life <= 0:
-                    self.particles.remove(p)
+            self._physics_tick(self.dt)
             # screen wrap for player mildly
             self.player.pos.x = clamp(self.player.pos.x, 16, SCREEN_SIZE[0] - 16)
             self.player.pos.y = clamp(self.player.pos.y, 16, SCREEN_SIZE[1] - 16)
@@ -336,6 +427,96 @@ class Game:
             if self.player.health <= 0:
                 self.state = "gameover"
 
+    def _physics_tick(self, dt):
+        """One fused simulation step over the SoA state.
+
+        Bullets are walked once: the compiled kernel integrates them, then
+        a single sweep does collision testing, damage, and live-bullet
+        compaction in the same pass instead of separate collide and compact
+        traversals. Particle integrate/cull/compact is likewise one pass.
+        """
+        # integrate bullets (compiled kernel)
+        nb = self.b_count
+        if nb:
+            game_kernels.integrate_bullets(self.b_pos[:nb], self.b_vel[:nb], self.b_life[:nb], dt)
+        # update enemies (AI stays per-object)
+        ppx, ppy = self.player.pos.x, self.player.pos.y
+        for e in self.enemies:
+            e.update(dt, ppx, ppy)
+            self.world_bounds(e)
+        # rebuild the spatial hash: bucket enemies by cell
+        grid = self.grid
+        grid.clear()
+        for i, e in enumerate(self.enemies):
+            grid[(int(e.px) // CELL, int(e.py) // CELL)].append(i)
+        # fused bullet sweep: expiry cull + collision + damage + compaction
+        damage = 20 * self.player.upgrades.get("damage", 1.0)
+        w = 0
+        for bi in range(nb):
+            if self.b_life[bi] <= 0:
+                continue
+            bx = float(self.b_pos[bi, 0])
+            by = float(self.b_pos[bi, 1])
+            # off-screen bullets die immediately instead of riding out their
+            # 2.2s lifetime where nothing can be hit
+            if bx < -32 or bx > SCREEN_SIZE[0] + 32 or by < -32 or by > SCREEN_SIZE[1] + 32:
+                continue
+            e = self._hit_enemy_near(grid, int(bx) // CELL, int(by) // CELL, bx, by, BULLET_RADIUS)
+            if e is not None:
+                # bullet consumed
+                e.health -= damage
+                # hit particles
+                self.emit_burst(e.px, e.py, 10, 40, 260, 0.3, 0.9, 2, 5, RED)
+                continue
+            if w != bi:
+                self.b_pos[w] = self.b_pos[bi]
+                self.b_vel[w] = self.b_vel[bi]
+                self.b_life[w] = self.b_life[bi]
+            w += 1
+        self.b_count = w
+        # player collision with enemies: same grid, cells around the player
+        # (runs before death compaction so the grid indices stay valid)
+        pcx, pcy = int(ppx) // CELL, int(ppy) // CELL
+        for gx in range(pcx - 1, pcx + 2):
+            for gy in range(pcy - 1, pcy + 2):
+                for ei in grid.get((gx, gy), ()):
+                    e = self.enemies[ei]
+                    dx = ppx - e.px
+                    dy = ppy - e.py
+                    rsum = self.player.radius + e.radius
+                    if dx * dx + dy * dy < rsum * rsum:
+                        self.player.health -= 30 * dt
+        # enemy deaths: single in-place compaction pass, no O(n) removes
+        w = 0
+        for e in self.enemies:
+            if e.health > 0:
+                self.enemies[w] = e
+                w += 1
+                continue
+            self.player.score += 10 if e.kind == 0 else 35
+            # explosion particles
+            self.emit_burst(e.px, e.py, 25, 40, 480, 0.6, 1.2, 3, 8, (RED, YELLOW, GREEN))
+        del self.enemies[w:]
+        # integrate + compact particles (compiled kernel + one mask pass)
+        n = self.p_count
+        if n:
+            game_kernels.integrate_particles(self.p_pos[:n], self.p_vel[:n], self.p_life[:n], dt)
+            # expire off-screen particles early; one fused boolean mask
+            px = self.p_pos[:n, 0]
+            py = self.p_pos[:n, 1]
+            alive = ((self.p_life[:n] > 0)
+                     & (px > -32) & (px < SCREEN_SIZE[0] + 32)
+                     & (py > -32) & (py < SCREEN_SIZE[1] + 32))
+            m = int(alive.sum())
+            if m < n:
+                self.p_pos[:m] = self.p_pos[:n][alive]
+                self.p_vel[:m] = self.p_vel[:n][alive]
+                self.p_life[:m] = self.p_life[:n][alive]
+                self.p_maxlife[:m] = self.p_maxlife[:n][alive]
+                self.p_size[:m] = self.p_size[:n][alive]
+                self.p_color[:m] = self.p_color[:n][alive]
+                self.p_count = m
+
     def draw_hud(self):
         # top-left boxes
         pygame.draw.rect(self.screen, UI_BG, (8, 8, 260, 68), border_radius=8)
@@ -344,36 +525,41 @@ class Game:
         hpw = int(220 * (self.player.health / self.player.max_health))
         if hpw > 0:
             pygame.draw.rect(self.screen, RED, (20, 20, hpw, 18), border_radius=8)
-        txt = self.font.render(f"Health: {int(self.player.health)}", True, WHITE)
+        txt = self._render_text(f"Health: {int(self.player.health)}", WHITE)
         self.screen.blit(txt, (24, 44))
         # score
-        score_txt = self.font.render(f"Score: {self.player.score}", True, WHITE)
+        score_txt = self._render_text(f"Score: {self.player.score}", WHITE)
         self.screen.blit(score_txt, (SCREEN_SIZE[0] - 160, 20))
-        wave_txt = self.font.render(f"Wave: {self.wave}", True, WHITE)
+        wave_txt = self._render_text(f"Wave: {self.wave}", WHITE)
         self.screen.blit(wave_txt, (SCREEN_SIZE[0] - 160, 48))
 
     def draw(self):
-        # background
-        self.screen.fill((18, 18, 20))
-        # subtle grid
-        gstep = 48
-        for x in range(0, SCREEN_SIZE[0], gstep):
-            pygame.draw.line(self.screen, (18, 18, 26), (x, 0), (x, SCREEN_SIZE[1]))
-        for y in range(0, SCREEN_SIZE[1], gstep):
-            pygame.draw.line(self.screen, (18, 18, 26), (0, y), (SCREEN_SIZE[0], y))
-
-        # draw entities sorted by y for simple depth
-        drawn = []
-        drawn.extend(self.enemies)
-        drawn.extend(self.bullets)
-        drawn.sort(key=lambda o: getattr(o, 'pos', Vector2(0, 0)).y)
-        for o in drawn:
-            o.draw(self.screen)
+        # background (pre-rendered fill + grid)
+        self.screen.blit(self._bg, (0, 0))
+
+        # draw enemies sorted by y for simple depth
+        for e in sorted(self.enemies, key=lambda e: e.py):
+            e.draw(self.screen)
+        # bullets from the SoA arrays
+        for i in range(self.b_count):
+            bx, by = self.b_pos[i]
+            vx, vy = self.b_vel[i]
+            inv = 6.0 / max(1e-6, math.hypot(vx, vy))
+            pygame.draw.line(self.screen, YELLOW, (bx, by), (bx - vx * inv, by - vy * inv), 2)
+            pygame.draw.circle(self.screen, YELLOW, (int(bx), int(by)), BULLET_RADIUS)
         # draw player above
         self.player.draw(self.screen, pygame.mouse.get_pos())
-        # particles on top
-        for p in self.particles:
-            p.draw(self.screen)
+        # particles on top: collect atlas sprites and submit in one blits call
+        blit_list = []
+        for i in range(self.p_count):
+            a = clamp(self.p_life[i] / self.p_maxlife[i], 0, 1)
+            s = self.p_size[i] * (0.6 + 0.4 * a)
+            # quantize to the atlas size buckets
+            bucket = 2 if s < 2.5 else 3 if s < 3.5 else 4 if s < 5 else 6 if s < 7 else 8
+            sprite = self._particle_sprite(self.p_color[i].tobytes(), bucket, int(a * 15))
+            blit_list.append((sprite, (self.p_pos[i, 0] - bucket * 0.5, self.p_pos[i, 1] - bucket * 0.5)))
+        if blit_list:
+            self.screen.blits(blit_list)
         # UI
         self.draw_hud()
         if self.paused:
@@ -384,10 +570,9 @@ class Game:
             self.draw_center_text("YOU DIED - R to restart", 40)
 
     def draw_center_text(self, text, size=28):
-        f = pygame.font.SysFont("Segoe UI", size, bold=True)
-        surf = f.render(text, True, WHITE)
+        surf = self._render_text(text, WHITE, size, bold=True)
         r = surf.get_rect(center=(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2))
-        shadow = f.render(text, True, (10, 10, 10))
+        shadow = self._render_text(text, (10, 10, 10), size, bold=True)
         self.screen.blit(shadow, (r.x + 4, r.y + 4))
         self.screen.blit(surf, r.topleft)
 
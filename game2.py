@@ -23,6 +23,7 @@ Controls:
 
 import random
 
+import numpy as np
 import pygame
 from pygame import Vector2
 
@@ -51,27 +52,104 @@ def clamp(a, b, c):
 
 
 # -------- PARTICLES --------
-class Particle:
-    def __init__(self, pos, vel, life, size, color):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(vel)
-        self.life = life
-        self.max_life = life
-        self.size = size
-        self.color = color
+class ParticlePool:
+    """Fixed-size particle pool in structure-of-arrays form.
+
+    State lives in parallel NumPy buffers, so the per-frame physics step is
+    a handful of vectorized array passes instead of N interpreter-level
+    Vector2 updates. Spawning takes a slot from the free list; expiry
+    returns it — no allocation and no list.remove."""
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.size = np.zeros(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        self.alive = np.zeros(capacity, bool)
+        self._free = list(range(capacity))
+
+    def spawn(self, pos, vel, life, size, color):
+        if not self._free:
+            return
+        i = self._free.pop()
+        self.pos[i] = pos
+        self.vel[i] = vel
+        self.life[i] = life
+        self.max_life[i] = life
+        self.size[i] = size
+        self.color[i] = color
+        self.alive[i] = True
+
+    def spawn_burst(self, n, pos, vx_range, vy_range, life_range, size_range, color, jitter=(0, 0)):
+        # one vectorized fill of n slots instead of n Python-level spawns
+        # (each of which costs several random.uniform calls and two Vector2s)
+        n = min(n, len(self._free))
+        if n <= 0:
+            return
+        idx = np.array([self._free.pop() for _ in range(n)])
+        self.pos[idx, 0] = pos[0] + np.random.uniform(-jitter[0], jitter[0], n)
+        self.pos[idx, 1] = pos[1] + np.random.uniform(-jitter[1], jitter[1], n)
+        self.vel[idx, 0] = np.random.uniform(min(vx_range), max(vx_range), n)
+        self.vel[idx, 1] = np.random.uniform(min(vy_range), max(vy_range), n)
+        life = np.random.uniform(life_range[0], life_range[1], n).astype(np.float32)
+        self.life[idx] = life
+        self.max_life[idx] = life
+        self.size[idx] = np.random.uniform(size_range[0], size_range[1], n)
+        self.color[idx] = color
+        self.alive[idx] = True
 
     def update(self, dt):
-        self.life -= dt
-        self.pos += self.vel * dt
-        self.vel *= 0.98
-
-    def draw(self, surf):
-        if self.life <= 0:
+        alive = self.alive
+        if not alive.any():
             return
-        a = clamp(self.life / self.max_life, 0, 1)
-        r = int(self.size * (0.6 + 0.4 * a))
-        col = tuple(int(c * (0.35 + 0.65 * a)) for c in self.color)
-        pygame.draw.circle(surf, col, (int(self.pos.x), int(self.pos.y)), r)
+        self.vel[alive] *= 0.98
+        self.pos[alive] += self.vel[alive] * dt
+        self.life[alive] -= dt
+        expired = alive & (self.life <= 0)
+        if expired.any():
+            self.alive &= self.life > 0
+            self._free.extend(np.nonzero(expired)[0].tolist())
+
+    # atlas of pre-rendered circles keyed by (color, radius, fade bucket);
+    # at most a few dozen tiny surfaces since spawns use 3 base colors
+    _atlas = {}
+
+    @classmethod
+    def _sprite(cls, color, r, bucket):
+        key = (color, r, bucket)
+        spr = cls._atlas.get(key)
+        if spr is None:
+            shade = 0.35 + 0.65 * (bucket / 7)
+            col = tuple(int(c * shade) for c in color)
+            spr = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(spr, col, (r, r), r)
+            cls._atlas[key] = spr
+        return spr
+
+    def draw(self, surf, cam_x=0):
+        # one batched blits call instead of a draw.circle round-trip per
+        # particle; life fraction is quantized to 8 fade buckets. Particles
+        # live in world space, so convert by cam_x here (they used to be
+        # drawn without it and drifted off-screen) and skip anything
+        # outside the window.
+        blit_list = []
+        w, h = SCREEN_SIZE
+        for i in np.nonzero(self.alive)[0]:
+            x = self.pos[i, 0] - cam_x
+            y = self.pos[i, 1]
+            if x < -8 or x > w + 8 or y < -8 or y > h + 8:
+                continue
+            a = clamp(self.life[i] / self.max_life[i], 0, 1)
+            r = int(self.size[i] * (0.6 + 0.4 * a))
+            if r <= 0:
+                continue
+            spr = self._sprite(self.color[i].tobytes(), r, int(a * 7))
+            blit_list.append((spr, (int(x) - r, int(y) - r)))
+        if blit_list:
+            surf.blits(blit_list, doreturn=False)
 
 
 # -------- GAME OBJECTS --------
@@ -89,6 +167,13 @@ class Player:
         self.stamina = 1.0
         self.score = 0
         self.combo = 0
+        # glow geometry never changes, only position: rasterize the 6 nested
+        # alpha rects once instead of every frame
+        self._glow_surf = pygame.Surface((self.width + 16, self.height + 16), pygame.SRCALPHA)
+        for i in range(6, 0, -1):
+            a = int(40 * (i / 6))
+            pygame.draw.rect(self._glow_surf, (*self.color, a),
+                             (8 - i, 8 - i, self.width + i * 2, self.height + i * 2), border_radius=8)
 
     def rect(self):
         return pygame.Rect(self.pos.x - self.width/2, self.pos.y - self.height, self.width, self.height)
@@ -133,12 +218,8 @@ class Player:
     def draw(self, surf, cam_x):
         r = self.rect()
         r.x -= cam_x
-        # neon rectangle with glow
-        glow = pygame.Surface((r.width+16, r.height+16), pygame.SRCALPHA)
-        for i in range(6, 0, -1):
-            a = int(40 * (i/6))
-            pygame.draw.rect(glow, (*self.color, a), (8-i, 8-i, r.width + i*2, r.height + i*2), border_radius=8)
-        surf.blit(glow, (r.x-8, r.y-8), special_flags=pygame.BLEND_ADD)
+        # neon rectangle with pre-rendered glow
+        surf.blit(self._glow_surf, (r.x-8, r.y-8), special_flags=pygame.BLEND_ADD)
         pygame.draw.rect(surf, self.color, r, border_radius=6)
         # eyes
         eye_w = 6
@@ -150,49 +231,68 @@ class Player:
 
 
 class Platform:
+    # slotted: many live instances, attributes hit every frame in the
+    # generation/collision/draw loops
+    __slots__ = ('x', 'y', 'w', 'h', 'color', '_rect')
+
     def __init__(self, x, y, w, h=24, color=None):
         self.x = x
         self.y = y
         self.w = w
         self.h = h
         self.color = color or (30, 30, 40)
+        # geometry is immutable; build the Rect once instead of per call
+        self._rect = pygame.Rect(x, y, w, h)
 
     def rect(self):
-        return pygame.Rect(self.x, self.y, self.w, self.h)
+        return self._rect
 
     def draw(self, surf, cam_x):
-        r = self.rect().copy()
-        r.x -= cam_x
+        r = (self.x - cam_x, self.y, self.w, self.h)
         pygame.draw.rect(surf, self.color, r)
         # neon edge
         pygame.draw.rect(surf, PINK, r, 2)
 
 
 class Obstacle:
+    __slots__ = ('pos', 'size', '_rect')
+
     def __init__(self, x, y, size=36):
         self.pos = Vector2(x, y)
         self.size = size
+        self._rect = pygame.Rect(x - size/2, y - size, size, size)
 
     def rect(self):
-        return pygame.Rect(self.pos.x - self.size/2, self.pos.y - self.size, self.size, self.size)
+        return self._rect
 
     def draw(self, surf, cam_x):
-        r = self.rect()
-        r.x -= cam_x
+        r = self._rect
+        x = r.x - cam_x
         # spiky neon
-        pygame.draw.polygon(surf, PINK, [(r.x, r.y+r.height), (r.x+r.width/2, r.y), (r.x+r.width, r.y+r.height)])
+        pygame.draw.polygon(surf, PINK, [(x, r.y+r.height), (x+r.width/2, r.y), (x+r.width, r.y+r.height)])
 
 
 class Orb:
+    __slots__ = ('pos', 'radius', 'dead')
+
+    # halo rings are identical for every orb; rendered once on first use
+    _halo = None
+
     def __init__(self, x, y):
         self.pos = Vector2(x, y)
         self.radius = 10
+        self.dead = False
+        if Orb._halo is None:
+            size = (self.radius + 4) * 2
+            halo = pygame.Surface((size, size), pygame.SRCALPHA)
+            for s in range(4, 0, -1):
+                a = int(30 * (s/4))
+                pygame.draw.circle(halo, (*ACCENT, a), (size//2, size//2), self.radius + s)
+            Orb._halo = halo
 
     def draw(self, surf, cam_x):
         p = (int(self.pos.x - cam_x), int(self.pos.y))
-        for s in range(4, 0, -1):
-            a = int(30 * (s/4))
-            pygame.draw.circle(surf, (*ACCENT, a), p, self.radius + s)
+        surf.blit(Orb._halo, (p[0] - self.radius - 4, p[1] - self.radius - 4))
         pygame.draw.circle(surf, ACCENT, p, self.radius)
 
 
@@ -210,6 +310,10 @@ class Level:
         self.platforms = []
         self.obstacles = []
         self.orbs = []
+        # parallel rect lists fed to Rect.collidelistall so overlap tests
+        # run in pygame's C loop rather than Python
+        self._platform_rects = []
+        self._obstacle_rects = []
         self.farthest_x = -100
         self.difficulty = 0.0
         # starting ground
@@ -224,10 +328,13 @@ class Level:
     def add_platform(self, x, y, w):
         p = Platform(x, y, w)
         self.platforms.append(p)
+        self._platform_rects.append(p._rect)
         self.farthest_x = max(self.farthest_x, x + w)
 
     def add_obstacle(self, x, y):
-        self.obstacles.append(Obstacle(x, y))
+        o = Obstacle(x, y)
+        self.obstacles.append(o)
+        self._obstacle_rects.append(o._rect)
 
     def add_orb(self, x, y):
         self.orbs.append(Orb(x, y))
@@ -256,13 +363,24 @@ class Level:
         self.platforms = [p for p in self.platforms if p.x + p.w > left_bound]
         self.obstacles = [o for o in self.obstacles if o.pos.x > left_bound]
         self.orbs = [o for o in self.orbs if o.pos.x > left_bound]
+        self._platform_rects = [p._rect for p in self.platforms]
+        self._obstacle_rects = [o._rect for o in self.obstacles]
 
     def draw(self, surf, cam_x):
+        # only draw what intersects the camera window; everything generated
+        # ahead of the player would otherwise still hit the blitter
+        right = cam_x + SCREEN_SIZE[0]
         for p in self.platforms:
+            if p.x + p.w < cam_x or p.x > right:
+                continue
             p.draw(surf, cam_x)
         for o in self.obstacles:
+            if o.pos.x + o.size < cam_x or o.pos.x - o.size > right:
+                continue
             o.draw(surf, cam_x)
         for b in self.orbs:
+            if b.pos.x + 14 < cam_x or b.pos.x - 14 > right:
+                continue
             b.draw(surf, cam_x)
 
 
@@ -276,13 +394,26 @@ class Game:
         self.dt = 0
         self.player = Player(Vector2(220, 320))
         self.level = Level()
-        self.particles = []
+        self.particles = ParticlePool(512)
         self.cam_x = 0
         self.running = True
         self.paused = False
         self.state = "menu"  # menu, playing, gameover
         self.font = pygame.font.SysFont("Arial", 20)
+        self._big_fonts = {}
+        self._text_cache = {}
+        self._last_ui = {}
+        self._ui_surfs = {}
         self.spawn_timer = 0
+        # parallax geometry repeats every 700px, so each band is baked into
+        # a strip once and scrolling is a single blit per band
+        self._parallax = []
+        for i, depth in enumerate([0.2, 0.45, 0.75]):
+            strip = pygame.Surface((SCREEN_SIZE[0] + 1400, 180), pygame.SRCALPHA)
+            col = (20 + i*6, 18 + i*6, 28 + i*6)
+            for x in range(0, SCREEN_SIZE[0] + 1401, 140):
+                pygame.draw.circle(strip, col, (x, 90), 60)
+            self._parallax.append((depth, 30 + i*90, strip))
 
     def handle_input(self):
         for event in pygame.event.get():
@@ -302,19 +433,17 @@ class Game:
                     else:
                         jumped = self.player.jump()
                         if jumped:
-                            for _ in range(12):
-                                self.particles.append(Particle(self.player.pos + Vector2(random.uniform(-6,6), 18), Vector2(random.uniform(-120,120), random.uniform(-280,-60)), random.uniform(0.4,0.9), random.uniform(2,5), PINK))
+                            self.particles.spawn_burst(12, (self.player.pos.x, self.player.pos.y + 18), (-120,120), (-280,-60), (0.4,0.9), (2,5), PINK, jitter=(6,0))
                 if event.key == pygame.K_LSHIFT:
                     if self.state == 'playing':
                         dashed = self.player.start_dash()
                         if dashed:
-                            for _ in range(16):
-                                self.particles.append(Particle(self.player.pos + Vector2(0, 10), Vector2(random.uniform(-280,280), random.uniform(-120,120)), random.uniform(0.2,0.5), random.uniform(2,6), NEON))
+                            self.particles.spawn_burst(16, (self.player.pos.x, self.player.pos.y + 10), (-280,280), (-120,120), (0.2,0.5), (2,6), NEON)
 
     def start(self):
         self.player = Player(Vector2(220, 320))
         self.level = Level()
-        self.particles = []
+        self.particles = ParticlePool(512)
         self.cam_x = 0
         self.state = 'playing'
         self.paused = False
@@ -331,59 +460,66 @@ class Game:
         # collisions with platforms
         self.player.on_ground = False
         pr = self.player.rect()
-        for p in self.level.platforms:
-            r = p.rect()
-            if pr.colliderect(r):
-                # simple resolution - place player on top if falling
-                if self.player.vel.y > 0 and pr.bottom - self.player.vel.y * self.dt <= r.top + 6:
-                    self.player.pos.y = r.top
-                    self.player.vel.y = 0
-                    self.player.on_ground = True
-                    self.player.double_jumps = MAX_DOUBLE_JUMP
+        px = self.player.pos.x
+        # batched overlap test: one C-level scan over all platform rects
+        for idx in pr.collidelistall(self.level._platform_rects):
+            r = self.level._platform_rects[idx]
+            # simple resolution - place player on top if falling
+            if self.player.vel.y > 0 and pr.bottom - self.player.vel.y * self.dt <= r.top + 6:
+                self.player.pos.y = r.top
+                self.player.vel.y = 0
+                self.player.on_ground = True
+                self.player.double_jumps = MAX_DOUBLE_JUMP
         # obstacle collision
-        for o in list(self.level.obstacles):
-            if pr.colliderect(o.rect()):
-                self.state = 'gameover'
-        # orb pickup
-        for orb in list(self.level.orbs):
-            if (Vector2(orb.pos) - self.player.pos).length() < 44:
+        if pr.collidelist(self.level._obstacle_rects) != -1:
+            self.state = 'gameover'
+        # orb pickup: mark collected orbs, then rebuild the list once —
+        # no O(n) remove scan per pickup
+        picked = False
+        px, py = self.player.pos.x, self.player.pos.y
+        for orb in self.level.orbs:
+            dx = orb.pos.x - px
+            dy = orb.pos.y - py
+            if dx*dx + dy*dy < 44*44:
+                orb.dead = True
+                picked = True
                 self.player.score += 10
                 self.player.combo += 1
-                self.level.orbs.remove(orb)
-                for _ in range(10):
-                    self.particles.append(Particle(orb.pos, Vector2(random.uniform(-120,120), random.uniform(-200,-40)), random.uniform(0.3,0.8), random.uniform(2,5), ACCENT))
+                self.particles.spawn_burst(10, orb.pos, (-120,120), (-200,-40), (0.3,0.8), (2,5), ACCENT)
+        if picked:
+            self.level.orbs = [o for o in self.level.orbs if not o.dead]
         # particle updates
-        for p in list(self.particles):
-            p.update(self.dt)
-            if p.life <= 0:
-                self.particles.remove(p)
+        self.particles.update(self.dt)
         # slightly move player forward if dashing
         if not self.player.dashing:
             # ensure player keeps running speed
             pass
         # small camera shake on high combo
         if self.player.combo > 0 and random.random() < 0.01:
-            self.particles.append(Particle(self.player.pos + Vector2(random.uniform(-8,8), random.uniform(-8,8)), Vector2(random.uniform(-120,120), random.uniform(-120,120)), 0.4, random.uniform(2,5), PINK))
+            self.particles.spawn_burst(1, self.player.pos, (-120,120), (-120,120), (0.4,0.4), (2,5), PINK, jitter=(8,8))
 
     def draw_background(self):
         self.screen.fill(BG)
-        # parallax bands
+        # parallax bands: blit the pre-rendered strips at the scroll offset;
+        # band y positions are baked alongside the strips
         w, h = SCREEN_SIZE
-        for i, depth in enumerate([0.2, 0.45, 0.75]):
-            offset = int((self.cam_x * depth) % 700)
-            for x in range(-700, w+700, 140):
-                cx = x - offset
-                y = 120 + i*90
-                pygame.draw.circle(self.screen, (20 + i*6, 18 + i*6, 28 + i*6), (cx, y), 60)
+        for depth, y, strip in self._parallax:
+            self.screen.blit(strip, (-int((self.cam_x * depth) % 700), y))
         # horizon line
         pygame.draw.rect(self.screen, (18,18,24), (0, 460, w, h-460))
 
+    def _ui_text(self, key, text, color):
+        # re-render only when a field's text actually changes; font.render
+        # hits FreeType and score/combo move on discrete events, not per frame
+        if self._last_ui.get(key) != text:
+            self._last_ui[key] = text
+            self._ui_surfs[key] = self.font.render(text, True, color)
+        return self._ui_surfs[key]
+
     def draw_ui(self):
         # top-left score
-        score_surf = self.font.render(f"Score: {self.player.score}", True, WHITE)
-        self.screen.blit(score_surf, (18, 12))
-        combo_surf = self.font.render(f"Combo: {self.player.combo}", True, PINK)
-        self.screen.blit(combo_surf, (18, 40))
+        self.screen.blit(self._ui_text('score', f"Score: {self.player.score}", WHITE), (18, 12))
+        self.screen.blit(self._ui_text('combo', f"Combo: {self.player.combo}", PINK), (18, 40))
         # stamina
         pygame.draw.rect(self.screen, (30,30,36), (18, 70, 200, 12), border_radius=6)
         pygame.draw.rect(self.screen, NEON, (18, 70, int(200*self.player.stamina), 12), border_radius=6)
@@ -393,8 +529,7 @@ class Game:
         # level geometry
         self.level.draw(self.screen, self.cam_x)
         # particles
-        for p in self.particles:
-            p.draw(self.screen)
+        self.particles.draw(self.screen, self.cam_x)
         # player
         self.player.draw(self.screen, self.cam_x)
         # UI
@@ -407,10 +542,14 @@ class Game:
             self.draw_center_text(f'GAME OVER - SCORE {self.player.score}  - PRESS SPACE TO RESTART', 26)
 
     def draw_center_text(self, text, size=28):
-        f = pygame.font.SysFont('Arial', size, bold=True)
-        surf = f.render(text, True, WHITE)
+        # fonts and rendered text are cached: menu/pause/gameover banners are
+        # static, so after the first frame this is two blits
+        cached = self._text_cache.get((text, size))
+        if cached is None:
+            f = self._big_fonts.setdefault(size, pygame.font.SysFont('Arial', size, bold=True))
+            cached = self._text_cache[(text, size)] = (f.render(text, True, WHITE), f.render(text, True, (4,4,6)))
+        surf, shadow = cached
         r = surf.get_rect(center=(SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2))
-        shadow = f.render(text, True, (4,4,6))
         self.screen.blit(shadow, (r.x+4, r.y+4))
         self.screen.blit(surf, r.topleft)
 
@@ -17,6 +17,9 @@ New Additions:
 import math
 import random
 import sys
+from collections import defaultdict
+
+import numpy as np
 import pygame
 from pygame import Vector2
 
@@ -28,6 +31,7 @@ PLAYER_MAX_HEALTH = 100
 PLAYER_AMMO = 30
 RELOAD_TIME = 1.5
 BULLET_SPEED = 700
+FIRE_RATE = 0.1
 WAVE_INTERVAL = 3.0
 
 # Colors
@@ -39,13 +43,14 @@ WHITE = (240, 240, 250)
 
 # -------- AUDIO --------
 def tone(frequency=440, duration_ms=200, volume=0.2):
+    # one vectorized sine into a single preallocated buffer instead of 44k
+    # Python iterations of math.sin + int.to_bytes + incremental bytearray
+    # growth (and its amortized reallocations) per generated sound
     sample_rate = 44100
     n_samples = int(sample_rate * duration_ms/1000)
-    buf = bytearray()
-    for i in range(n_samples):
-        val = int(volume*32767*math.sin(2*math.pi*frequency*(i/sample_rate)))
-        buf += val.to_bytes(2, byteorder="little", signed=True)
-    return pygame.mixer.Sound(buffer=buf)
+    phase = (2*np.pi*frequency/sample_rate) * np.arange(n_samples, dtype=np.float32)
+    samples = (volume*32767.0*np.sin(phase)).astype(np.int16)
+    return pygame.mixer.Sound(buffer=samples.tobytes())
 
 shoot_sfx = None
 reload_sfx = None
@@ -64,40 +69,145 @@ def init_audio():
     music.play(loops=-1)
 
 # -------- PARTICLES --------
-class Particle:
-    def __init__(self, pos, vel, life, size, color):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(vel)
-        self.life = life
-        self.max_life = life
-        self.size = size
-        self.color = color
+class ParticlePool:
+    """Fixed-size particle pool in structure-of-arrays form: state lives in
+    parallel NumPy buffers so the physics step is a few vectorized array
+    passes instead of N Vector2 updates in the interpreter. Spawning takes
+    a slot from the free list; expiry returns it."""
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.size = np.zeros(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        self.alive = np.zeros(capacity, bool)
+        self._free = list(range(capacity))
+
+    def spawn(self, pos, vel, life, size, color):
+        if not self._free:
+            return
+        i = self._free.pop()
+        self.pos[i] = pos
+        self.vel[i] = vel
+        self.life[i] = life
+        self.max_life[i] = life
+        self.size[i] = size
+        self.color[i] = color
+        self.alive[i] = True
+
+    def spawn_burst(self, n, pos, vx_range, vy_range, life_range, size_range, color, jitter=(0, 0)):
+        # one vectorized fill of n slots instead of n Python-level spawns
+        # (each of which costs several random.uniform calls and two Vector2s)
+        n = min(n, len(self._free))
+        if n <= 0:
+            return
+        idx = np.array([self._free.pop() for _ in range(n)])
+        self.pos[idx, 0] = pos[0] + np.random.uniform(-jitter[0], jitter[0], n)
+        self.pos[idx, 1] = pos[1] + np.random.uniform(-jitter[1], jitter[1], n)
+        self.vel[idx, 0] = np.random.uniform(min(vx_range), max(vx_range), n)
+        self.vel[idx, 1] = np.random.uniform(min(vy_range), max(vy_range), n)
+        life = np.random.uniform(life_range[0], life_range[1], n).astype(np.float32)
+        self.life[idx] = life
+        self.max_life[idx] = life
+        self.size[idx] = np.random.uniform(size_range[0], size_range[1], n)
+        self.color[idx] = color
+        self.alive[idx] = True
 
     def update(self, dt):
-        self.life -= dt
-        self.pos += self.vel * dt
-        self.vel *= 0.96
+        alive = self.alive
+        if not alive.any():
+            return
+        self.vel[alive] *= 0.96
+        self.pos[alive] += self.vel[alive] * dt
+        self.life[alive] -= dt
+        expired = alive & (self.life <= 0)
+        if expired.any():
+            self.alive &= self.life > 0
+            self._free.extend(np.nonzero(expired)[0].tolist())
+
+    # atlas of pre-rendered alpha circles keyed by (color, radius, fade
+    # bucket); stays tiny since spawns only use a couple of base colors
+    _atlas = {}
+
+    @classmethod
+    def _sprite(cls, color, r, bucket):
+        key = (color, r, bucket)
+        spr = cls._atlas.get(key)
+        if spr is None:
+            alpha = int(255 * bucket / 7)
+            spr = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(spr, tuple(color) + (alpha,), (r, r), r)
+            cls._atlas[key] = spr
+        return spr
 
     def draw(self, surf):
-        if self.life <= 0:
-            return
-        alpha = max(0, int(255 * (self.life/self.max_life)))
-        col = (*self.color, alpha)
-        pygame.draw.circle(surf, col, (int(self.pos.x), int(self.pos.y)), int(self.size))
+        # one batched blits call instead of a draw.circle round-trip per
+        # particle; life fraction is quantized to 8 fade buckets
+        blit_list = []
+        w, h = SCREEN_SIZE
+        for i in np.nonzero(self.alive)[0]:
+            x = self.pos[i, 0]
+            y = self.pos[i, 1]
+            if x < -8 or x > w + 8 or y < -8 or y > h + 8:
+                continue
+            frac = max(0.0, min(1.0, self.life[i] / self.max_life[i]))
+            r = int(self.size[i])
+            if r <= 0:
+                continue
+            spr = self._sprite(self.color[i].tobytes(), r, int(frac * 7))
+            blit_list.append((spr, (int(x) - r, int(y) - r)))
+        if blit_list:
+            surf.blits(blit_list, doreturn=False)
+
+# -------- COLLISION BROAD PHASE --------
+class SpatialHash:
+    """Uniform grid over (x//cell, y//cell) buckets. Rebuilt each frame;
+    a query touches only the 3x3 neighborhood of a point, so bullet/enemy
+    collision drops from O(B*E) pair tests to O(B + E)."""
+
+    def __init__(self, cell=64):
+        self.cell = cell
+        self.cells = defaultdict(list)
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, obj, x, y):
+        self.cells[(int(x) // self.cell, int(y) // self.cell)].append(obj)
+
+    def query(self, x, y):
+        cx, cy = int(x) // self.cell, int(y) // self.cell
+        get = self.cells.get
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                bucket = get((gx, gy))
+                if bucket:
+                    yield from bucket
 
 # -------- GAME OBJECTS --------
 class Bullet:
-    def __init__(self, pos, dir):
-        self.pos = Vector2(pos)
-        self.vel = dir.normalize() * BULLET_SPEED
+    # plain float fields: no Vector2 copy at construction and the hot
+    # integration step is straight float arithmetic, not operator dispatch
+    __slots__ = ('x', 'y', 'vx', 'vy', 'life', 'dead')
+
+    def __init__(self, pos, vx, vy):
+        self.x = pos[0]
+        self.y = pos[1]
+        self.vx = vx
+        self.vy = vy
         self.life = 1.2
+        self.dead = False
 
     def update(self, dt):
-        self.pos += self.vel * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
         self.life -= dt
 
     def draw(self, surf):
-        pygame.draw.circle(surf, NEON, (int(self.pos.x), int(self.pos.y)), 4)
+        pygame.draw.circle(surf, NEON, (int(self.x), int(self.y)), 4)
 
 class Player:
     def __init__(self, pos):
@@ -106,6 +216,7 @@ class Player:
         self.ammo = PLAYER_AMMO
         self.reloading = False
         self.reload_timer = 0
+        self.fire_cooldown = 0.0
         self.score = 0
 
     def update(self, dt, keys):
@@ -118,6 +229,9 @@ class Player:
             move = move.normalize()
         self.pos += move * PLAYER_SPEED * dt
 
+        if self.fire_cooldown > 0:
+            self.fire_cooldown -= dt
+
         if self.reloading:
             self.reload_timer -= dt
             if self.reload_timer <= 0:
@@ -129,9 +243,14 @@ class Player:
         pygame.draw.rect(surf, NEON, r, border_radius=8)
 
 class Enemy:
+    # no per-instance __dict__: hundreds of live enemies, and the update
+    # loops hit these attributes every frame
+    __slots__ = ('pos', 'etype', 'health', 'speed', 'dead')
+
     def __init__(self, pos, etype="normal"):
         self.pos = Vector2(pos)
         self.etype = etype
+        self.dead = False
         if etype == "fast":
             self.health = 20
             self.speed = 200
@@ -145,12 +264,6 @@ class Enemy:
             self.health = 30
             self.speed = 120
 
-    def update(self, dt, player):
-        dir = player.pos - self.pos
-        if dir.length_squared() > 0:
-            dir = dir.normalize()
-        self.pos += dir * self.speed * dt
-
     def draw(self, surf):
         size = 28 if self.etype!="boss" else 80
         color = PINK if self.etype!="tank" else ACCENT
@@ -168,13 +281,32 @@ class Game:
         self.player = Player(Vector2(SCREEN_SIZE[0]/2, SCREEN_SIZE[1]/2))
         self.bullets = []
         self.enemies = []
-        self.particles = []
+        self.particles = ParticlePool(512)
+        self.enemy_hash = SpatialHash(64)
         self.running = True
         self.state = "menu"
         self.font = pygame.font.SysFont("Arial", 20)
+        self._big_fonts = {}
+        self._text_cache = {}
+        self._last_ui = {}
+        self._ui_surfs = {}
         self.spawn_timer = 0
         self.wave = 1
         self.controller = None
+        # the grid never changes: bake it into a background surface once
+        self._grid_bg = pygame.Surface(SCREEN_SIZE)
+        self._grid_bg.fill(BG)
+        for x in range(0, SCREEN_SIZE[0], 40):
+            pygame.draw.line(self._grid_bg, (20,20,30), (x,0), (x,SCREEN_SIZE[1]))
+        for y in range(0, SCREEN_SIZE[1], 40):
+            pygame.draw.line(self._grid_bg, (20,20,30), (0,y), (SCREEN_SIZE[0],y))
+        # lighting: pre-rendered glow sprites plus one persistent overlay
+        # surface that gets cleared (memset) rather than reallocated per frame
+        self._enemy_light = pygame.Surface((161, 161), pygame.SRCALPHA)
+        pygame.draw.circle(self._enemy_light, (255,255,255,30), (80, 80), 80)
+        self._player_light = pygame.Surface((241, 241), pygame.SRCALPHA)
+        pygame.draw.circle(self._player_light, (255,255,255,80), (120, 120), 120)
+        self._light_overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
         self.init_controller()
         init_audio()
 
@@ -204,14 +336,20 @@ class Game:
 
         if self.state == "playing":
             if pygame.mouse.get_pressed()[0]:
-                if self.player.ammo > 0 and not self.player.reloading:
+                p = self.player
+                # cooldown caps the fire rate (holding the button used to
+                # fire every frame); aim math stays scalar — no Vector2
+                # allocation or normalize() per shot
+                if p.ammo > 0 and not p.reloading and p.fire_cooldown <= 0:
+                    p.fire_cooldown = FIRE_RATE
                     mx, my = pygame.mouse.get_pos()
-                    dir = Vector2(mx, my) - self.player.pos
-                    self.bullets.append(Bullet(self.player.pos, dir))
-                    self.player.ammo -= 1
+                    dx = mx - p.pos.x
+                    dy = my - p.pos.y
+                    inv = 1.0 / (math.hypot(dx, dy) or 1.0)
+                    self.bullets.append(Bullet(p.pos, dx*inv*BULLET_SPEED, dy*inv*BULLET_SPEED))
+                    p.ammo -= 1
                     shoot_sfx.play()
-                    for _ in range(4):
-                        self.particles.append(Particle(self.player.pos, dir.normalize()*-random.uniform(60,200), 0.3, 2, NEON))
+                    self.particles.spawn_burst(4, p.pos, (dx*inv*-200, dx*inv*-60), (dy*inv*-200, dy*inv*-60), (0.3,0.3), (2,2), NEON)
 
     def spawn_wave(self):
         types = ["normal", "fast", "tank"]
@@ -234,7 +372,7 @@ class Game:
         self.player = Player(Vector2(SCREEN_SIZE[0]/2, SCREEN_SIZE[1]/2))
         self.bullets = []
         self.enemies = []
-        self.particles = []
+        self.particles = ParticlePool(512)
         self.wave = 1
         self.spawn_wave()
         self.state = "playing"
@@ -243,34 +381,72 @@ class Game:
         keys = pygame.key.get_pressed()
         self.player.update(self.dt, keys)
 
-        for b in list(self.bullets):
+        for b in self.bullets:
             b.update(self.dt)
             if b.life <= 0:
-                self.bullets.remove(b)
-
-        for e in list(self.enemies):
-            e.update(self.dt, self.player)
-            if (e.pos - self.player.pos).length() < 28:
+                b.dead = True
+
+        # homing step for every enemy in one vectorized pass: gather
+        # positions/speeds, normalize toward the player in NumPy, scatter
+        # back — no per-enemy Vector2.normalize/sqrt in the interpreter
+        if self.enemies:
+            pos = np.array([(e.pos.x, e.pos.y) for e in self.enemies], np.float32)
+            speed = np.array([e.speed for e in self.enemies], np.float32)
+            d = np.array((self.player.pos.x, self.player.pos.y), np.float32) - pos
+            n = np.linalg.norm(d, axis=1, keepdims=True)
+            n[n == 0] = 1
+            pos += (d / n) * speed[:, None] * self.dt
+            for e, (x, y) in zip(self.enemies, pos):
+                e.pos.update(float(x), float(y))
+
+        # broad phase: bucket enemies into the grid and only test each
+        # bullet (and the player) against its 3x3 neighborhood; below 32
+        # enemies the grid rebuild costs more than it saves, so brute-force
+        use_hash = len(self.enemies) >= 32
+        if use_hash:
+            self.enemy_hash.clear()
+            for e in self.enemies:
+                self.enemy_hash.insert(e, e.pos.x, e.pos.y)
+
+        # squared-distance tests on raw coordinates: no transient Vector2
+        # and no sqrt inside the collision loops
+        px, py = self.player.pos.x, self.player.pos.y
+        near = self.enemy_hash.query(px, py) if use_hash else self.enemies
+        for e in near:
+            dx = e.pos.x - px
+            dy = e.pos.y - py
+            if dx*dx + dy*dy < 28*28:
                 self.player.health -= 20*self.dt
                 hit_sfx.play()
                 if self.player.health <= 0:
                     self.state = "gameover"
-            for b in list(self.bullets):
-                if (e.pos - b.pos).length() < 20:
+
+        for b in self.bullets:
+            if b.dead:
+                continue
+            bx, by = b.x, b.y
+            candidates = self.enemy_hash.query(bx, by) if use_hash else self.enemies
+            for e in candidates:
+                if e.dead:
+                    continue
+                dx = e.pos.x - bx
+                dy = e.pos.y - by
+                if dx*dx + dy*dy < 20*20:
+                    b.dead = True
                     e.health -= 20
                     if e.health <= 0:
+                        e.dead = True
                         self.player.score += 10 if e.etype!="boss" else 200
-                        self.enemies.remove(e)
                         explosion_sfx.play()
-                        for _ in range(12):
-                            self.particles.append(Particle(e.pos, Vector2(random.uniform(-200,200), random.uniform(-200,200)), 0.5, 3, PINK))
-                    self.bullets.remove(b)
+                        self.particles.spawn_burst(12, e.pos, (-200,200), (-200,200), (0.5,0.5), (3,3), PINK)
                     break
 
-        for p in list(self.particles):
-            p.update(self.dt)
-            if p.life <= 0:
-                self.particles.remove(p)
+        # dead entities are only marked above; compact each list once per
+        # frame instead of paying an O(n) remove scan per casualty
+        self.bullets = [b for b in self.bullets if not b.dead]
+        self.enemies = [e for e in self.enemies if not e.dead]
+
+        self.particles.update(self.dt)
 
         if not self.enemies:
             self.spawn_timer += self.dt
@@ -280,28 +456,29 @@ class Game:
                 self.spawn_timer = 0
 
     def draw_grid(self):
-        self.screen.fill(BG)
-        for x in range(0, SCREEN_SIZE[0], 40):
-            pygame.draw.line(self.screen, (20,20,30), (x,0), (x,SCREEN_SIZE[1]))
-        for y in range(0, SCREEN_SIZE[1], 40):
-            pygame.draw.line(self.screen, (20,20,30), (0,y), (SCREEN_SIZE[0],y))
+        self.screen.blit(self._grid_bg, (0,0))
 
     def draw_lighting(self):
-        overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-        for e in self.enemies:
-            pygame.draw.circle(overlay, (255,255,255,30), (int(e.pos.x), int(e.pos.y)), 80)
-        pygame.draw.circle(overlay, (255,255,255,80), (int(self.player.pos.x), int(self.player.pos.y)), 120)
+        overlay = self._light_overlay
+        overlay.fill((0,0,0,0))
+        blit_list = [(self._enemy_light, (int(e.pos.x)-80, int(e.pos.y)-80)) for e in self.enemies]
+        blit_list.append((self._player_light, (int(self.player.pos.x)-120, int(self.player.pos.y)-120)))
+        overlay.blits(blit_list, doreturn=False)
         self.screen.blit(overlay, (0,0), special_flags=pygame.BLEND_RGBA_ADD)
 
+    def _ui_text(self, key, text, color):
+        # re-render only when a field's text actually changes; font.render
+        # hits FreeType and the values move on discrete events, not per frame
+        if self._last_ui.get(key) != text:
+            self._last_ui[key] = text
+            self._ui_surfs[key] = self.font.render(text, True, color)
+        return self._ui_surfs[key]
+
     def draw_ui(self):
-        hp = self.font.render(f"HP: {int(self.player.health)}", True, WHITE)
-        ammo = self.font.render(f"Ammo: {self.player.ammo if not self.player.reloading else 'Reloading'}", True, NEON)
-        score = self.font.render(f"Score: {self.player.score}", True, PINK)
-        wave = self.font.render(f"Wave: {self.wave}", True, ACCENT)
-        self.screen.blit(hp, (12,12))
-        self.screen.blit(ammo, (12,34))
-        self.screen.blit(score, (12,56))
-        self.screen.blit(wave, (12,78))
+        self.screen.blit(self._ui_text('hp', f"HP: {int(self.player.health)}", WHITE), (12,12))
+        self.screen.blit(self._ui_text('ammo', f"Ammo: {self.player.ammo if not self.player.reloading else 'Reloading'}", NEON), (12,34))
+        self.screen.blit(self._ui_text('score', f"Score: {self.player.score}", PINK), (12,56))
+        self.screen.blit(self._ui_text('wave', f"Wave: {self.wave}", ACCENT), (12,78))
 
     def draw(self):
         self.draw_grid()
@@ -310,8 +487,7 @@ class Game:
         for e in self.enemies:
             e.draw(self.screen)
         self.player.draw(self.screen)
-        for p in self.particles:
-            p.draw(self.screen)
+        self.particles.draw(self.screen)
         self.draw_lighting()
         self.draw_ui()
         if self.state == "menu":
@@ -320,8 +496,12 @@ class Game:
             self.draw_center_text(f"GAME OVER - SCORE {self.player.score} - PRESS SPACE TO RESTART")
 
     def draw_center_text(self, text):
-        f = pygame.font.SysFont("Arial", 34, bold=True)
-        surf = f.render(text, True, WHITE)
+        # font + rendered banner cached: menu/gameover text is static, so
+        # after the first frame this is a single blit
+        surf = self._text_cache.get(text)
+        if surf is None:
+            f = self._big_fonts.setdefault(34, pygame.font.SysFont("Arial", 34, bold=True))
+            surf = self._text_cache[text] = f.render(text, True, WHITE)
         r = surf.get_rect(center=(SCREEN_SIZE[0]//2, SCREEN_SIZE[1]//2))
         self.screen.blit(surf, r)
 
@@ -20,9 +20,12 @@ import math
 import random
 import json
 import os
+import queue
+import threading
 import time
-from collections import deque
+from collections import defaultdict, deque
 
+import numpy as np
 import pygame
 from pygame import Vector2
 
@@ -55,11 +58,70 @@ def clamp(v, a, b):
 # Basic RNG seed useful for testing reproducible runs
 random.seed()
 
+# Optional numba acceleration: the collision kernel compiles to native code
+# when numba is installed; otherwise the plain-Python fallback path is used.
+try:
+    from numba import njit
+    NUMBA_OK = True
+except ImportError:
+    NUMBA_OK = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
+# Optional CUDA offload for the particle step: only used when numba sees an
+# actual GPU, and only once the particle count is large enough to amortize
+# the host/device copies.
+try:
+    from numba import cuda
+    CUDA_OK = cuda.is_available()
+except Exception:
+    CUDA_OK = False
+
+if CUDA_OK:
+    @cuda.jit
+    def _cuda_particle_step(pos, vel, life, alive, dt):
+        i = cuda.grid(1)
+        if i < pos.shape[0] and alive[i]:
+            pos[i, 0] += vel[i, 0] * dt
+            pos[i, 1] += vel[i, 1] * dt
+            vel[i, 0] *= 0.92
+            vel[i, 1] *= 0.92
+            life[i] -= dt
+
+@njit(cache=True, fastmath=True)
+def _collide_projectiles(px, py, dmg, alive, ex, ey, er, ehp, hit_idx):
+    """Pairwise projectile-vs-enemy sweep over flat float arrays.
+
+    Marks each projectile's first hit in hit_idx, clears its alive flag and
+    decrements the enemy hp array in place."""
+    for i in range(px.shape[0]):
+        if alive[i] == 0:
+            continue
+        for j in range(ex.shape[0]):
+            if ehp[j] <= 0:
+                continue
+            r = er[j] + 6.0
+            dx = px[i] - ex[j]
+            dy = py[i] - ey[j]
+            if dx*dx + dy*dy < r*r:
+                ehp[j] -= dmg[i]
+                alive[i] = 0
+                hit_idx[i] = j
+                break
+    return hit_idx
+
 # -------- SAVE / UNLOCKS --------
 class SaveData:
     def __init__(self):
         self.gold_total = 0
         self.unlocked = {'double_dash': False, 'extra_hp': False}
+        # writes happen on a daemon thread: save() just drops the serialized
+        # blob on a one-slot queue, so a disk flush never stalls a frame
+        self._pending = queue.Queue(maxsize=1)
+        threading.Thread(target=self._writer, daemon=True).start()
         self.load()
 
     def load(self):
@@ -72,9 +134,37 @@ class SaveData:
             except Exception as e:
                 print('Failed to load save:', e)
 
+    def _writer(self):
+        while True:
+            blob = self._pending.get()
+            try:
+                tmp = SAVE_FILE + '.tmp'
+                with open(tmp, 'w') as f:
+                    f.write(blob)
+                os.replace(tmp, SAVE_FILE)
+            except Exception as e:
+                print('Failed to write save:', e)
+            finally:
+                self._pending.task_done()
+
     def save(self):
-        with open(SAVE_FILE, 'w') as f:
-            json.dump({'gold_total': self.gold_total, 'unlocked': self.unlocked}, f)
+        blob = json.dumps({'gold_total': self.gold_total, 'unlocked': self.unlocked})
+        # debounce: if a write is already queued, replace it with the newer
+        # state rather than piling up flushes
+        try:
+            self._pending.put_nowait(blob)
+        except queue.Full:
+            try:
+                self._pending.get_nowait()
+                self._pending.task_done()
+            except queue.Empty:
+                pass
+            self._pending.put_nowait(blob)
+
+    def flush(self):
+        # wait for the writer to drain (used at exit so the daemon thread
+        # cannot die with a save still queued)
+        self._pending.join()
 
 save_data = SaveData()
 
@@ -92,36 +182,47 @@ class Dungeon:
     def __init__(self, seed=None):
         self.seed = seed or random.randint(0, 10**9)
         random.seed(self.seed)
-        self.tiles = [['#' for _ in range(MAP_H)] for __ in range(MAP_W)]
+        # contiguous uint8 grid (1=wall, 0=floor), row-major [y, x] so each
+        # map row is one memory block; carving is slice assignment and
+        # lookups skip the double list dereference
+        self.tiles = np.ones((MAP_H, MAP_W), dtype=np.uint8)
         self.rooms = []
         self.generate()
 
     def create_room(self, room: RectRoom):
-        for i in range(room.x, room.x + room.w):
-            for j in range(room.y, room.y + room.h):
-                if 0 <= i < MAP_W and 0 <= j < MAP_H:
-                    self.tiles[i][j] = '.'
+        x0, y0 = max(0, room.x), max(0, room.y)
+        x1, y1 = min(MAP_W, room.x + room.w), min(MAP_H, room.y + room.h)
+        self.tiles[y0:y1, x0:x1] = 0
 
     def create_h_tunnel(self, x1, x2, y):
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            if 0 <= x < MAP_W and 0 <= y < MAP_H:
-                self.tiles[x][y] = '.'
+        if 0 <= y < MAP_H:
+            self.tiles[y, max(0, min(x1, x2)):min(MAP_W, max(x1, x2) + 1)] = 0
 
     def create_v_tunnel(self, y1, y2, x):
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            if 0 <= x < MAP_W and 0 <= y < MAP_H:
-                self.tiles[x][y] = '.'
+        if 0 <= x < MAP_W:
+            self.tiles[max(0, min(y1, y2)):min(MAP_H, max(y1, y2) + 1), x] = 0
 
     def generate(self):
         self.rooms = []
+        # placed-room bounds mirrored into parallel arrays so each overlap
+        # test is one vectorized comparison against every room at once
+        # instead of a Python generator over pairwise intersects()
+        rx = np.empty(MAX_ROOMS, np.int32)
+        ry = np.empty(MAX_ROOMS, np.int32)
+        rw = np.empty(MAX_ROOMS, np.int32)
+        rh = np.empty(MAX_ROOMS, np.int32)
+        n = 0
         for _ in range(MAX_ROOMS):
             w = random.randint(ROOM_MIN, ROOM_MAX)
             h = random.randint(ROOM_MIN, ROOM_MAX)
             x = random.randint(1, MAP_W - w - 2)
             y = random.randint(1, MAP_H - h - 2)
-            new_room = RectRoom(x, y, w, h)
-            if any(new_room.intersects(r) for r in self.rooms):
+            if n and ((x <= rx[:n] + rw[:n]) & (x + w >= rx[:n]) &
+                      (y <= ry[:n] + rh[:n]) & (y + h >= ry[:n])).any():
                 continue
+            new_room = RectRoom(x, y, w, h)
+            rx[n], ry[n], rw[n], rh[n] = x, y, w, h
+            n += 1
             self.create_room(new_room)
             if self.rooms:
                 (prev_x, prev_y) = self.rooms[-1].center
@@ -136,36 +237,130 @@ class Dungeon:
 
     def get_tile(self, tx, ty):
         if 0 <= tx < MAP_W and 0 <= ty < MAP_H:
-            return self.tiles[tx][ty]
-        return '#'
+            return int(self.tiles[ty, tx])
+        return 1
 
 # -------- ENTITIES --------
-class Particle:
-    def __init__(self, pos, vel, life, col):
-        self.pos = Vector2(pos)
-        self.vel = Vector2(vel)
-        self.life = life
-        self.max_life = life
-        self.col = col
+class ParticleSystem:
+    """Particle state in structure-of-arrays form.
+
+    Positions, velocities, lifetimes and colors live in preallocated
+    parallel NumPy buffers, so the per-frame integration runs as a few
+    vectorized array passes instead of one Python-level Vector2 update per
+    particle. Slots are recycled through a free list — no allocation churn
+    from grenade bursts or kill effects."""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.col = np.zeros((capacity, 3), np.uint8)
+        self.alive = np.zeros(capacity, bool)
+        self._free = list(range(capacity))
+        # atlas key per slot, fixed at spawn time, so draw never rebuilds a
+        # color key (bytes/tuple) per particle per frame
+        self._colkey = [b''] * capacity
+
+    def spawn(self, pos, vel, life, col):
+        if not self._free:
+            return
+        i = self._free.pop()
+        self.pos[i] = pos
+        self.vel[i] = vel
+        self.life[i] = life
+        self.max_life[i] = life
+        self.col[i] = col
+        self._colkey[i] = bytes(col)
+        self.alive[i] = True
+
+    def spawn_burst(self, n, pos, speed, life_range, col, jitter=0.0):
+        """Spawn n particles in one shot via array-sized random draws.
+
+        Bursts (grenades, kills, hits) used to loop over spawn() with four
+        random.uniform calls per particle; this fills the claimed slots with
+        slice assignments instead."""
+        free = self._free
+        n = min(n, len(free))
+        if n == 0:
+            return
+        idx = np.array([free.pop() for _ in range(n)])
+        self.pos[idx] = pos + np.random.uniform(-jitter, jitter, (n, 2)).astype(np.float32)
+        self.vel[idx] = np.random.uniform(-speed, speed, (n, 2))
+        life = np.random.uniform(life_range[0], life_range[1], n).astype(np.float32)
+        self.life[idx] = life
+        self.max_life[idx] = life
+        self.col[idx] = col
+        colkey = bytes(col)
+        for i in idx.tolist():
+            self._colkey[i] = colkey
+        self.alive[idx] = True
 
     def update(self, dt):
-        self.life -= dt
-        self.pos += self.vel * dt
-        self.vel *= 0.92
+        alive = self.alive
+        if not alive.any():
+            return
+        if CUDA_OK and int(alive.sum()) >= 2048:
+            # dense enough to be worth the device round-trip: step the whole
+            # buffer on the GPU, one thread per slot
+            blocks = (self.capacity + 255) // 256
+            _cuda_particle_step[blocks, 256](self.pos, self.vel, self.life, alive, np.float32(dt))
+        else:
+            self.pos[alive] += self.vel[alive] * dt
+            self.vel[alive] *= 0.92
+            self.life[alive] -= dt
+        expired = alive & (self.life <= 0)
+        if expired.any():
+            self.alive &= self.life > 0
+            self._free.extend(np.nonzero(expired)[0].tolist())
+
+    # LUT of pre-rendered alpha circles keyed by (color, radius, fade
+    # bucket); only a handful of base colors are ever spawned, so this
+    # stays a few dozen tiny surfaces
+    _atlas = {}
+
+    @classmethod
+    def _sprite(cls, color, r, bucket):
+        key = (color, r, bucket)
+        spr = cls._atlas.get(key)
+        if spr is None:
+            alpha = int(255 * bucket / 7)
+            spr = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.circle(spr, tuple(color) + (alpha,), (r, r), r)
+            cls._atlas[key] = spr
+        return spr
 
     def draw(self, surf, cam):
-        if self.life <= 0:
+        # one batched blits call per frame instead of a draw.circle
+        # round-trip per particle; fade is quantized to 8 alpha buckets
+        idx = np.nonzero(self.alive)[0]
+        if idx.size == 0:
             return
-        a = int(255 * (self.life/self.max_life))
-        pygame.draw.circle(surf, (*self.col, a), (int(self.pos.x - cam.x), int(self.pos.y - cam.y)), max(1, int(4 * (self.life/self.max_life))))
+        # drop off-screen particles with one vectorized bounds mask before
+        # building the blit list
+        sx = self.pos[idx, 0] - cam.x
+        sy = self.pos[idx, 1] - cam.y
+        w, h = surf.get_size()
+        on = (sx > -8) & (sx < w + 8) & (sy > -8) & (sy < h + 8)
+        blit_list = []
+        for i, x, y in zip(idx[on], sx[on], sy[on]):
+            frac = min(1.0, self.life[i] / self.max_life[i])
+            r = max(1, int(4 * frac))
+            spr = self._sprite(self._colkey[i], r, int(frac * 7))
+            blit_list.append((spr, (int(x) - r, int(y) - r)))
+        if blit_list:
+            surf.blits(blit_list, doreturn=False)
 
 class Projectile:
-    def __init__(self, pos, vel, owner, dmg=12, life=2.0):
+    # ownership is encoded by which list a projectile lives in (player vs
+    # enemy), so there is no owner reference or per-frame dispatch at all
+    def __init__(self, pos, vel, dmg=12, life=2.0):
         self.pos = Vector2(pos)
         self.vel = Vector2(vel)
-        self.owner = owner
         self.dmg = dmg
         self.life = life
+        self.dead = False
 
     def update(self, dt):
         self.pos += self.vel * dt
@@ -176,6 +371,44 @@ class Projectile:
             return
         pygame.draw.circle(surf, (255, 240, 200), (int(self.pos.x - cam.x), int(self.pos.y - cam.y)), 4)
 
+class ProjectileRing:
+    """Fixed-size SoA ring for the player's shots.
+
+    Sword and pistol shots are short-lived, so sustained fire used to churn
+    a Projectile object plus two Vector2s per shot. Firing now overwrites
+    the oldest slot in preallocated arrays and the whole ring advances in
+    one vectorized pass; a slot is live while life > 0."""
+
+    SIZE = 128
+
+    def __init__(self):
+        n = self.SIZE
+        self.pos = np.zeros((n, 2), np.float32)
+        self.vel = np.zeros((n, 2), np.float32)
+        self.life = np.zeros(n, np.float32)
+        self.dmg = np.zeros(n, np.float32)
+        self._head = 0
+
+    def fire(self, x, y, vx, vy, dmg, life):
+        i = self._head
+        self._head = (i + 1) % self.SIZE
+        self.pos[i] = (x, y)
+        self.vel[i] = (vx, vy)
+        self.dmg[i] = dmg
+        self.life[i] = life
+
+    def live_indices(self):
+        return np.nonzero(self.life > 0)[0]
+
+    def update(self, dt):
+        # advance every slot (dead ones carry life <= 0 and contribute
+        # nothing); returns the grenade slots that expired this frame
+        was_live = self.life > 0
+        self.pos += self.vel * dt
+        self.life -= dt
+        boom = was_live & (self.life <= 0) & (self.dmg >= 40)
+        return np.nonzero(boom)[0]
+
 class Enemy:
     def __init__(self, pos, kind=0):
         self.pos = Vector2(pos)
@@ -186,27 +419,9 @@ class Enemy:
         self.speed = 120 if kind == 0 else 70
         self.aggro = 220 if kind == 0 else 350
         self.fire_cooldown = 0
-
-    def update(self, dt, player, projectiles, particles):
-        to_player = player.pos - self.pos
-        dist = to_player.length()
-        if self.kind == 0:  # melee simple
-            if dist < self.aggro:
-                dirv = to_player.normalize()
-                self.pos += dirv * self.speed * dt
-        else:  # ranged
-            if dist < self.aggro:
-                # keep distance
-                if dist < 160:
-                    self.pos -= to_player.normalize() * self.speed * dt
-                elif dist > 220:
-                    self.pos += to_player.normalize() * self.speed * dt
-                # fire
-                self.fire_cooldown -= dt
-                if self.fire_cooldown <= 0:
-                    self.fire_cooldown = 1.1
-                    vel = to_player.normalize() * 360
-                    projectiles.append(Projectile(self.pos + to_player.normalize()*22, vel, owner=self, dmg=14))
+        # squared hit radius (incl. projectile size), cached so collision
+        # tests compare against length_squared with no sqrt
+        self._r2 = float((self.radius + 6) ** 2)
 
     def draw(self, surf, cam):
         c = COL_ENEMY if self.kind == 0 else (180, 100, 220)
@@ -229,8 +444,11 @@ class Player:
         self.gold = 0
         self.weapons = ['sword', 'pistol', 'grenade']
         self.cur_weapon = 1
-        self.projectiles = []
-        self.particles = []
+        self.projectiles = ProjectileRing()
+        # font built once, label surfaces rendered once per weapon — the
+        # old draw path constructed a SysFont and re-rendered every frame
+        self._font = pygame.font.SysFont('Arial', 16)
+        self._label_cache = {}
 
     def switch_weapon(self, idx):
         self.cur_weapon = idx % len(self.weapons)
@@ -244,19 +462,24 @@ class Player:
 
     def shoot(self, target):
         w = self.weapons[self.cur_weapon]
-        dirv = (Vector2(target) - self.pos)
-        if dirv.length_squared() == 0:
-            dirv = Vector2(1, 0)
-        dirv = dirv.normalize()
+        # scalar normalize: one hypot and one Vector2 instead of the
+        # subtract/length/normalize temporaries
+        dx = target.x - self.pos.x
+        dy = target.y - self.pos.y
+        d = math.hypot(dx, dy)
+        if d == 0:
+            dx, dy, d = 1.0, 0.0, 1.0
+        inv = 1.0 / d
+        dirv = Vector2(dx * inv, dy * inv)
         if w == 'pistol':
-            self.projectiles.append(Projectile(self.pos + dirv*20, dirv*520, self, dmg=18))
+            self.projectiles.fire(self.pos.x + dirv.x*20, self.pos.y + dirv.y*20, dirv.x*520, dirv.y*520, 18, 2.0)
         elif w == 'grenade':
-            self.projectiles.append(Projectile(self.pos + dirv*20, dirv*360 + Vector2(0,-40), self, dmg=45, life=1.6))
+            self.projectiles.fire(self.pos.x + dirv.x*20, self.pos.y + dirv.y*20, dirv.x*360, dirv.y*360 - 40, 45, 1.6)
         elif w == 'sword':
             # melee slash simulated via short-range projectile
-            self.projectiles.append(Projectile(self.pos + dirv*28, dirv*240, self, dmg=34, life=0.25))
+            self.projectiles.fire(self.pos.x + dirv.x*28, self.pos.y + dirv.y*28, dirv.x*240, dirv.y*240, 34, 0.25)
 
-    def update(self, dt, keys, mouse_pos, projectiles_global, particles):
+    def update(self, dt, keys, mouse_pos, particles):
         # movement
         move = Vector2(0,0)
         if keys[pygame.K_w] or keys[pygame.K_UP]: move.y -= 1
@@ -272,23 +495,20 @@ class Player:
         self.vel += (move*target_speed - self.vel) * clamp(12*dt, 0, 1)
         self.pos += self.vel * dt
         self.inv_timer = max(0, self.inv_timer - dt)
-        # update own projectiles and push to global on expiry
-        for pr in list(self.projectiles):
-            pr.update(dt)
-            if pr.life <= 0:
-                # create explosion for grenade
-                if pr.dmg >= 40:
-                    for _ in range(18):
-                        particles.append(Particle(pr.pos + Vector2(random.uniform(-6,6), random.uniform(-6,6)), Vector2(random.uniform(-120,120), random.uniform(-120,120)), random.uniform(0.4,0.9), (240,180,60)))
-                projectiles_global.append(pr)
-                self.projectiles.remove(pr)
+        # advance the shot ring in one vectorized pass; grenades whose life
+        # just ran out detonate
+        ring = self.projectiles
+        for i in ring.update(dt):
+            particles.spawn_burst(18, (float(ring.pos[i, 0]), float(ring.pos[i, 1])), 120, (0.4, 0.9), (240,180,60), jitter=6)
 
     def draw(self, surf, cam):
         c = COL_PLAYER if self.inv_timer<=0 else (255,255,200)
         pygame.draw.circle(surf, c, (int(self.pos.x - cam.x), int(self.pos.y - cam.y)), self.radius)
         # weapon indicator
-        font = pygame.font.SysFont('Arial', 16)
-        txt = font.render(self.weapons[self.cur_weapon].upper(), True, COL_UI)
+        w = self.weapons[self.cur_weapon]
+        txt = self._label_cache.get(w)
+        if txt is None:
+            txt = self._label_cache[w] = self._font.render(w.upper(), True, COL_UI)
         surf.blit(txt, (int(self.pos.x - cam.x - txt.get_width()/2), int(self.pos.y - cam.y - self.radius - 22)))
 
 # -------- GAME MANAGER --------
@@ -300,19 +520,37 @@ class Game:
         self.clock = pygame.time.Clock()
         self.dt = 0
         self.dungeon = Dungeon()
+        self.map_surf = self._build_map_surface()
         # spawn player in first room center
         cx, cy = self.dungeon.rooms[0].center
         self.player = Player(Vector2(cx*TILE + TILE/2, cy*TILE + TILE/2))
         self.enemies = []
-        self.projectiles = []
-        self.particles = []
+        # enemy shots live here; player shots stay on the Player, so each
+        # collision pass only walks the projectiles it can actually hit
+        self.enemy_projectiles = []
+        self.particles = ParticleSystem(4096)
         self.cam = Vector2(self.player.pos)
         self.running = True
         self.state = 'playing'  # menu, playing, shop
         self.font = pygame.font.SysFont('Arial', 18)
+        self.font_shop = pygame.font.SysFont('Arial', 22)
         self.spawn_enemies_wave(3)
         self.room_index = 0
         self.shake = 0
+        self.shop_click = False
+        # rendered-text cache: HUD strings repeat for many frames in a row
+        # (hp/gold only change on events), so font.render runs only when a
+        # string it has not seen before shows up
+        self._text_cache = {}
+
+    def text(self, s, font, col=COL_UI):
+        key = (s, id(font), col)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 512:
+                self._text_cache.clear()
+            surf = self._text_cache[key] = font.render(s, True, col)
+        return surf
 
     def spawn_enemies_wave(self, n):
         # spawn enemies in rooms except first
@@ -325,8 +563,6 @@ class Game:
             self.enemies.append(Enemy(epos, kind))
 
     def handle_input(self):
-        keys = pygame.key.get_pressed()
-        mx, my = pygame.mouse.get_pos()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -344,65 +580,127 @@ class Game:
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and self.state=='playing':
                     # shoot toward mouse
-                    world_mouse = Vector2(mx, my) + self.cam - Vector2(SCREEN[0]/2, SCREEN[1]/2)
-                    self.player.shoot(world_mouse)
-        return keys
+                    self.player.shoot(self.world_mouse)
+                elif event.button == 1 and self.state=='shop':
+                    # edge-triggered: one purchase attempt per click, not
+                    # one per frame the button is held
+                    self.shop_click = True
+
+    def _update_enemies(self):
+        # batch AI pass: gather enemy state into arrays, step every
+        # chase/retreat vector in a few NumPy ops, scatter positions back;
+        # only ranged enemies whose cooldown fires drop back into Python
+        if not self.enemies:
+            return
+        dt = self.dt
+        pos = np.array([(e.pos.x, e.pos.y) for e in self.enemies], np.float32)
+        to_p = np.array((self.player.pos.x, self.player.pos.y), np.float32) - pos
+        dist = np.hypot(to_p[:, 0], to_p[:, 1])
+        dirv = to_p / np.maximum(dist, 1e-6)[:, None]
+        kind = np.array([e.kind for e in self.enemies])
+        speed = np.array([e.speed for e in self.enemies], np.float32)
+        aggro = np.array([e.aggro for e in self.enemies], np.float32)
+        awake = dist < aggro
+        step = np.zeros(len(self.enemies), np.float32)
+        melee = awake & (kind == 0)
+        step[melee] = speed[melee]
+        ranged = awake & (kind == 1)
+        back = ranged & (dist < 160)
+        fwd = ranged & (dist > 220)
+        step[back] = -speed[back]
+        step[fwd] = speed[fwd]
+        pos += dirv * (step * dt)[:, None]
+        for e, (x, y) in zip(self.enemies, pos):
+            e.pos.update(float(x), float(y))
+        # cooldowns only tick while aggroed, matching the old per-object AI
+        for i in np.nonzero(ranged)[0]:
+            e = self.enemies[int(i)]
+            e.fire_cooldown -= dt
+            if e.fire_cooldown <= 0:
+                e.fire_cooldown = 1.1
+                d = Vector2(float(dirv[i, 0]), float(dirv[i, 1]))
+                self.enemy_projectiles.append(Projectile(e.pos + d*22, d*360, dmg=14))
 
     def physics(self):
-        keys = pygame.key.get_pressed()
-        mx, my = pygame.mouse.get_pos()
-        world_mouse = Vector2(mx, my) + self.cam - Vector2(SCREEN[0]/2, SCREEN[1]/2)
-        self.player.update(self.dt, keys, world_mouse, self.projectiles, self.particles)
-        # update enemies
-        for e in list(self.enemies):
-            e.update(self.dt, self.player, self.projectiles, self.particles)
+        self.player.update(self.dt, self.keys, self.world_mouse, self.particles)
+        self._update_enemies()
+        # dead enemies are dropped in a single rebuild
+        any_dead = False
+        for e in self.enemies:
             if e.hp <= 0:
+                any_dead = True
                 self.player.gold += 8 if e.kind==0 else 28
                 save_data.gold_total += 8 if e.kind==0 else 28
-                for _ in range(12):
-                    self.particles.append(Particle(e.pos + Vector2(random.uniform(-6,6), random.uniform(-6,6)), Vector2(random.uniform(-120,120), random.uniform(-120,120)), random.uniform(0.4,1.0), (240,100,100)))
-                self.enemies.remove(e)
-        # update global projectiles (including those emitted by enemies)
-        for pr in list(self.projectiles):
+                self.particles.spawn_burst(12, (e.pos.x, e.pos.y), 120, (0.4, 1.0), (240,100,100), jitter=6)
+        if any_dead:
+            self.enemies = [e for e in self.enemies if e.hp > 0]
+        # update enemy shots against the player; casualties are only marked
+        # dead here and compacted once below
+        r2_player = (self.player.radius + 6) ** 2
+        for pr in self.enemy_projectiles:
             pr.update(self.dt)
-            # collisions
             if pr.life <= 0:
-                try:
-                    self.projectiles.remove(pr)
-                except:
-                    pass
+                pr.dead = True
                 continue
-            # if owner is enemy, check hit player
-            if isinstance(pr.owner, Enemy):
-                if (pr.pos - self.player.pos).length() < self.player.radius + 6 and self.player.inv_timer<=0:
-                    self.player.hp -= pr.dmg
-                    self.player.inv_timer = 0.6
-                    self.shake = 6
-                    for _ in range(8):
-                        self.particles.append(Particle(self.player.pos + Vector2(random.uniform(-6,6), random.uniform(-6,6)), Vector2(random.uniform(-120,120), random.uniform(-120,120)), random.uniform(0.2,0.7), (240,200,80)))
-                    try:
-                        self.projectiles.remove(pr)
-                    except:
-                        pass
-            # if owner player, check hit enemy
-            elif isinstance(pr.owner, Player):
+            if (pr.pos - self.player.pos).length_squared() < r2_player and self.player.inv_timer<=0:
+                self.player.hp -= pr.dmg
+                self.player.inv_timer = 0.6
+                self.shake = 6
+                self.particles.spawn_burst(8, (self.player.pos.x, self.player.pos.y), 120, (0.2, 0.7), (240,200,80), jitter=6)
+                pr.dead = True
+        # player shots vs enemies, tested while in flight; hit slots are
+        # retired by zeroing their life
+        ring = self.player.projectiles
+        live = ring.live_indices()
+        if live.size and self.enemies:
+            if NUMBA_OK:
+                # flat-array kernel: the whole pairwise sweep runs as one
+                # native-code call, fed slices straight out of the ring
+                px = ring.pos[live, 0]
+                py = ring.pos[live, 1]
+                dmg = ring.dmg[live]
+                alive = np.ones(live.size, np.uint8)
+                ex = np.array([e.pos.x for e in self.enemies], np.float32)
+                ey = np.array([e.pos.y for e in self.enemies], np.float32)
+                er = np.array([e.radius for e in self.enemies], np.float32)
+                ehp = np.array([e.hp for e in self.enemies], np.float32)
+                hit_idx = np.full(live.size, -1, np.int32)
+                _collide_projectiles(px, py, dmg, alive, ex, ey, er, ehp, hit_idx)
+                for e, hp in zip(self.enemies, ehp):
+                    e.hp = float(hp)
+                for i in np.nonzero(hit_idx >= 0)[0]:
+                    s = int(live[i])
+                    self.particles.spawn_burst(6, (float(ring.pos[s, 0]), float(ring.pos[s, 1])), 80, (0.2, 0.6), (255,200,120), jitter=3)
+                    ring.life[s] = 0.0
+            else:
+                # fallback broad phase: bucket enemies by 64px cell so each
+                # projectile only tests its 3x3 neighborhood
+                grid = defaultdict(list)
                 for e in self.enemies:
-                    if (pr.pos - e.pos).length() < e.radius + 6:
-                        e.hp -= pr.dmg
-                        for _ in range(6):
-                            self.particles.append(Particle(pr.pos + Vector2(random.uniform(-3,3), random.uniform(-3,3)), Vector2(random.uniform(-80,80), random.uniform(-80,80)), random.uniform(0.2,0.6), (255,200,120)))
-                        try:
-                            self.projectiles.remove(pr)
-                        except:
-                            pass
-        # update particles
-        for p in list(self.particles):
-            p.update(self.dt)
-            if p.life <= 0:
-                try:
-                    self.particles.remove(p)
-                except:
-                    pass
+                    grid[(int(e.pos.x) >> 6, int(e.pos.y) >> 6)].append(e)
+                for s in live.tolist():
+                    x, y = float(ring.pos[s, 0]), float(ring.pos[s, 1])
+                    cx, cy = int(x) >> 6, int(y) >> 6
+                    hit = False
+                    for gx in (cx-1, cx, cx+1):
+                        for gy in (cy-1, cy, cy+1):
+                            for e in grid.get((gx, gy), ()):
+                                ddx = x - e.pos.x
+                                ddy = y - e.pos.y
+                                if ddx*ddx + ddy*ddy < e._r2:
+                                    e.hp -= float(ring.dmg[s])
+                                    self.particles.spawn_burst(6, (x, y), 80, (0.2, 0.6), (255,200,120), jitter=3)
+                                    ring.life[s] = 0.0
+                                    hit = True
+                                    break
+                            if hit:
+                                break
+                        if hit:
+                            break
+        # single compaction per frame for the enemy-shot casualties above
+        self.enemy_projectiles = [pr for pr in self.enemy_projectiles if not pr.dead]
+        # update particles (one vectorized pass over the SoA buffers)
+        self.particles.update(self.dt)
 
     def update(self):
         if self.state != 'playing':
@@ -421,22 +719,23 @@ class Game:
             # next wave bigger
             self.spawn_enemies_wave(3 + random.randint(0,3))
 
+    def _build_map_surface(self):
+        # the dungeon is static for the run: rasterize every tile once and
+        # blit a viewport per frame instead of ~470 draw.rect calls
+        surf = pygame.Surface((MAP_W*TILE, MAP_H*TILE))
+        surf.fill(COL_WALL)
+        ys, xs = np.nonzero(self.dungeon.tiles == 0)
+        for j, i in zip(ys.tolist(), xs.tolist()):
+            surf.fill(COL_FLOOR, (i*TILE, j*TILE, TILE, TILE))
+        return surf
+
     def draw_map(self):
-        # draw tiles around camera
-        cam_tile_x = int((self.cam.x) // TILE)
-        cam_tile_y = int((self.cam.y) // TILE)
-        tiles_x = SCREEN[0]//TILE + 4
-        tiles_y = SCREEN[1]//TILE + 4
-        start_x = clamp(cam_tile_x - tiles_x//2, 0, MAP_W-tiles_x)
-        start_y = clamp(cam_tile_y - tiles_y//2, 0, MAP_H-tiles_y)
-        for i in range(start_x, min(MAP_W, start_x + tiles_x)):
-            for j in range(start_y, min(MAP_H, start_y + tiles_y)):
-                t = self.dungeon.get_tile(i, j)
-                rect = pygame.Rect((i*TILE - self.cam.x + SCREEN[0]//2, j*TILE - self.cam.y + SCREEN[1]//2), (TILE, TILE))
-                if t == '#':
-                    pygame.draw.rect(self.screen, COL_WALL, rect)
-                else:
-                    pygame.draw.rect(self.screen, COL_FLOOR, rect)
+        # blit the camera's viewport out of the pre-rendered map
+        vx = int(self.cam.x) - SCREEN[0]//2
+        vy = int(self.cam.y) - SCREEN[1]//2
+        sx, sy = max(0, vx), max(0, vy)
+        dx, dy = sx - vx, sy - vy
+        self.screen.blit(self.map_surf, (dx, dy), area=pygame.Rect(sx, sy, SCREEN[0]-dx, SCREEN[1]-dy))
 
     def draw(self):
         # background
@@ -445,16 +744,26 @@ class Game:
         self.draw_map()
         # entities
         cam_offset = self.cam - Vector2(SCREEN[0]/2, SCREEN[1]/2)
+        # cull anything outside the view (plus a margin for radii and hp
+        # bars) before paying for its draw call
+        vx, vy = cam_offset.x - 32, cam_offset.y - 32
+        vr, vb = vx + SCREEN[0] + 64, vy + SCREEN[1] + 64
         # projectiles
-        for pr in list(self.player.projectiles) + list(self.projectiles):
-            pr.draw(self.screen, cam_offset)
+        ring = self.player.projectiles
+        for i in ring.live_indices().tolist():
+            x, y = ring.pos[i]
+            if vx <= x <= vr and vy <= y <= vb:
+                pygame.draw.circle(self.screen, (255, 240, 200), (int(x - cam_offset.x), int(y - cam_offset.y)), 4)
+        for pr in self.enemy_projectiles:
+            if vx <= pr.pos.x <= vr and vy <= pr.pos.y <= vb:
+                pr.draw(self.screen, cam_offset)
         for e in self.enemies:
-            e.draw(self.screen, cam_offset)
+            if vx <= e.pos.x <= vr and vy <= e.pos.y <= vb:
+                e.draw(self.screen, cam_offset)
         # player
         self.player.draw(self.screen, cam_offset)
         # particles
-        for p in self.particles:
-            p.draw(self.screen, cam_offset)
+        self.particles.draw(self.screen, cam_offset)
         # HUD
         self.draw_hud()
         if self.state == 'shop':
@@ -463,13 +772,13 @@ class Game:
     def draw_hud(self):
         font = self.font
         # HP
-        hp_s = font.render(f'HP: {int(self.player.hp)}/{int(self.player.max_hp)}', True, COL_UI)
+        hp_s = self.text(f'HP: {int(self.player.hp)}/{int(self.player.max_hp)}', font)
         self.screen.blit(hp_s, (12, 12))
         # gold
-        gold_s = font.render(f'Gold: {self.player.gold} (Total: {save_data.gold_total})', True, COL_UI)
+        gold_s = self.text(f'Gold: {self.player.gold} (Total: {save_data.gold_total})', font)
         self.screen.blit(gold_s, (12, 36))
         # weapon
-        w_s = font.render(f'Weapon: {self.player.weapons[self.player.cur_weapon]}', True, COL_UI)
+        w_s = self.text(f'Weapon: {self.player.weapons[self.player.cur_weapon]}', font)
         self.screen.blit(w_s, (12, 60))
 
     def draw_shop(self):
@@ -477,23 +786,23 @@ class Game:
         srect = pygame.Rect(200, 100, SCREEN[0]-400, SCREEN[1]-200)
         pygame.draw.rect(self.screen, (18,18,22), srect)
         pygame.draw.rect(self.screen, (90,90,110), srect, 3)
-        font = pygame.font.SysFont('Arial', 22)
-        title = font.render('SHOP - Press TAB to leave', True, COL_UI)
+        font = self.font_shop
+        title = self.text('SHOP - Press TAB to leave', font)
         self.screen.blit(title, (srect.x+18, srect.y+14))
         items = [('Double Dash', 150, 'double_dash'), ('Extra Max HP', 240, 'extra_hp')]
         y = srect.y + 64
         for name, cost, key in items:
-            txt = font.render(f'{name}  -  {cost} gold', True, COL_UI)
+            txt = self.text(f'{name}  -  {cost} gold', font)
             self.screen.blit(txt, (srect.x+24, y))
             buy_rect = pygame.Rect(srect.x + srect.w - 140, y, 110, 28)
             pygame.draw.rect(self.screen, (60,60,80), buy_rect)
-            btxt = font.render('BUY', True, COL_UI)
+            btxt = self.text('BUY', font)
             self.screen.blit(btxt, (buy_rect.x + 30, buy_rect.y + 4))
             y += 48
         # simple mouse click handler
-        mx, my = pygame.mouse.get_pos()
-        mdown = pygame.mouse.get_pressed()
-        if mdown[0]:
+        if self.shop_click:
+            self.shop_click = False
+            mx, my = self.mouse_pos
             # detect clicks roughly in item area
             idx = (my - (srect.y + 64)) // 48
             if 0 <= idx < len(items):
@@ -507,13 +816,19 @@ class Game:
     def run(self):
         while self.running:
             self.dt = self.clock.tick(FPS)/1000.0
-            keys = self.handle_input()
+            # poll input once per frame; handle_input, physics and the shop
+            # all read these instead of round-tripping into SDL again
+            self.keys = pygame.key.get_pressed()
+            self.mouse_pos = pygame.mouse.get_pos()
+            self.world_mouse = Vector2(self.mouse_pos) + self.cam - Vector2(SCREEN[0]/2, SCREEN[1]/2)
+            self.handle_input()
             if self.state == 'playing':
                 self.update()
             self.draw()
             pygame.display.flip()
         pygame.quit()
         save_data.save()
+        save_data.flush()
 
 if __name__ == '__main__':
     Game().run()
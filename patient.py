@@ -1,26 +1,47 @@
 # ambulance_full_map_app.py
 
+import asyncio
+import functools
+import json
 import threading
 import time
 import math
+from collections import defaultdict
+import numpy as np
 import requests
+from scipy.spatial import cKDTree
 import tkinter as tk
 from tkinter import messagebox
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, create_engine
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Index, bindparam, create_engine, event, select, update
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 import uvicorn
 import folium
-from tkhtmlview import HTMLLabel
+from tkinterweb import HtmlFrame
 import io
 import base64
 
 # ----------------- Database Setup -----------------
 Base = declarative_base()
 engine = create_engine("sqlite:///ambulance.db", connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(bind=engine)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    # applied on every raw DBAPI connection, not just the first one:
+    # WAL + NORMAL sync cuts the per-commit fsync cost, temp tables stay
+    # in memory, and mmap lets reads come straight from the page cache
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
+# no autoflush on every query, and objects stay usable after commit
+# instead of triggering a re-SELECT per attribute access
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 class User(Base):
     __tablename__ = "users"
@@ -38,6 +59,10 @@ class Driver(Base):
     current_lat = Column(Float, default=0.0)
     current_lon = Column(Float, default=0.0)
 
+# covering index: the dispatch scan resolves as an index-only lookup of
+# available drivers instead of a full-table scan
+Index("ix_driver_avail_pos", Driver.is_available, Driver.current_lat, Driver.current_lon)
+
 class AmbulanceRequest(Base):
     __tablename__ = "requests"
     id = Column(Integer, primary_key=True)
@@ -66,17 +91,172 @@ def get_db():
     finally:
         db.close()
 
+# Optional numba acceleration: when available, the nearest-driver fallback
+# runs as a compiled parallel loop; otherwise the NumPy path is used.
+try:
+    from numba import njit, prange
+    NUMBA_OK = True
+except ImportError:
+    NUMBA_OK = False
+
+if NUMBA_OK:
+    @njit(cache=True, fastmath=True)
+    def _gc_dist_degrees(lat1, lon1, lat2, lon2):
+        lat1r = math.radians(lat1)
+        lat2r = math.radians(lat2)
+        dlat = lat2r - lat1r
+        dlon = math.radians(lon2 - lon1)
+        a = math.sin(dlat*0.5)**2 + math.cos(lat1r)*math.cos(lat2r)*math.sin(dlon*0.5)**2
+        return 6371.0 * 2.0 * math.asin(math.sqrt(a))
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _nearest_idx(plat, plon, lats, lons):
+        n = lats.shape[0]
+        dists = np.empty(n, np.float64)
+        for i in prange(n):
+            dists[i] = _gc_dist_degrees(plat, plon, lats[i], lons[i])
+        return np.argmin(dists)
+
 # ----------------- Utility -----------------
 def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    dlat = math.radians(lat2 - lat1)
+    # each latitude is converted to radians exactly once, and
+    # 2*asin(sqrt(a)) replaces atan2(sqrt(a), sqrt(1-a)) — same result,
+    # one transcendental cheaper
+    lat1r = math.radians(lat1)
+    lat2r = math.radians(lat2)
+    dlat = lat2r - lat1r
     dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1))*math.cos(math.radians(lat2))*math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+    a = math.sin(dlat*0.5)**2 + math.cos(lat1r)*math.cos(lat2r)*math.sin(dlon*0.5)**2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+def _haversine_vec(lat0, lon0, lats, lons):
+    """Distances in km from one origin to arrays of points, vectorized.
+
+    One NumPy expression over the whole fleet instead of a Python-level
+    haversine call per driver."""
+    lat0r = np.radians(lat0)
+    lon0r = np.radians(lon0)
+    latsr = np.radians(lats)
+    lonsr = np.radians(lons)
+    dlat = latsr - lat0r
+    dlon = lonsr - lon0r
+    a = np.sin(dlat*0.5)**2 + np.cos(lat0r)*np.cos(latsr)*np.sin(dlon*0.5)**2
+    return 6371 * 2 * np.arcsin(np.sqrt(a))
+
+def nearest_to(lat0, lon0, lats, lons):
+    """Index of the point closest to one fixed origin.
+
+    Specialized for the 1-to-N dispatch pattern: the origin's radians and
+    cosine are evaluated once as scalars, and since arcsin(sqrt(a)) is
+    monotonic in a, the argmin runs on the raw haversine term without ever
+    materializing distances in km."""
+    lat0r = math.radians(lat0)
+    lon0r = math.radians(lon0)
+    coslat0 = math.cos(lat0r)
+    latsr = np.radians(lats)
+    dlat = latsr - lat0r
+    dlon = np.radians(lons) - lon0r
+    a = np.sin(dlat*0.5)**2 + coslat0*np.cos(latsr)*np.sin(dlon*0.5)**2
+    return int(np.argmin(a))
+
+# ----------------- Spatial index -----------------
+class DriverIndex:
+    """KD-tree over the available drivers' positions.
+
+    Location updates and availability toggles just mark the index dirty;
+    the next nearest() call rebuilds the tree from the DB in one pass, so
+    dispatch queries are O(log N) instead of a scan of the whole fleet.
+    Coordinates are equirectangular-projected, which is accurate enough at
+    city scale for a euclidean KD-tree."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tree = None
+        self._ids = []
+        self._mean_lat = 0.0
+        self._dirty = True
+
+    def invalidate(self):
+        with self._lock:
+            self._dirty = True
+
+    def _rebuild(self, db):
+        rows = db.query(Driver.id, Driver.current_lat, Driver.current_lon).filter(Driver.is_available==True).all()
+        self._ids = [r[0] for r in rows]
+        if rows:
+            lats = np.radians(np.array([r[1] for r in rows]))
+            lons = np.radians(np.array([r[2] for r in rows]))
+            self._mean_lat = float(lats.mean())
+            pts = np.column_stack((lons * math.cos(self._mean_lat), lats))
+            self._tree = cKDTree(pts)
+        else:
+            self._tree = None
+        self._dirty = False
+
+    def nearest(self, db, lat, lon, k=8):
+        """Return up to k candidate driver ids, nearest first."""
+        with self._lock:
+            if self._dirty:
+                self._rebuild(db)
+            if self._tree is None:
+                return []
+            q = (math.radians(lon) * math.cos(self._mean_lat), math.radians(lat))
+            _, idx = self._tree.query(q, k=min(k, len(self._ids)))
+            return [self._ids[int(i)] for i in np.atleast_1d(idx)]
+
+driver_index = DriverIndex()
 
 # ----------------- WebSocket -----------------
 active_connections = {}
+# patient sockets subscribed to a driver's location, keyed by driver id
+patient_subscribers = defaultdict(set)
+_loop = None
+
+# location frames land here and are flushed as one batched UPDATE every
+# 250 ms instead of a SELECT+commit per WebSocket message
+pending_locations = {}
+_pending_lock = asyncio.Lock()
+_flush_stmt = update(Driver).where(Driver.id == bindparam("b_id")).values(
+    current_lat=bindparam("b_lat"), current_lon=bindparam("b_lon"))
+
+async def _flush_locations():
+    while True:
+        await asyncio.sleep(0.25)
+        async with _pending_lock:
+            snapshot = dict(pending_locations)
+            pending_locations.clear()
+        if not snapshot:
+            continue
+        params = [{"b_id": k, "b_lat": la, "b_lon": lo} for k, (la, lo) in snapshot.items()]
+
+        def write():
+            db = SessionLocal()
+            try:
+                db.execute(_flush_stmt, params)
+                db.commit()
+            finally:
+                db.close()
+        # the SQLite write is synchronous; run it in a worker thread so
+        # the event loop keeps serving sockets while it commits
+        await asyncio.to_thread(write)
+        driver_index.invalidate()
+
+@app.on_event("startup")
+async def _capture_loop():
+    # lets sync endpoints (run in the threadpool) schedule broadcasts
+    global _loop
+    _loop = asyncio.get_running_loop()
+    asyncio.create_task(_flush_locations())
+
+async def _broadcast_location(driver_id, lat, lon):
+    dead = []
+    for ws in patient_subscribers.get(driver_id, ()):
+        try:
+            await ws.send_json({"driver_id": driver_id, "lat": lat, "lon": lon})
+        except Exception:
+            dead.append(ws)
+    for ws in dead:
+        patient_subscribers[driver_id].discard(ws)
 
 @app.websocket("/ws/driver/{driver_id}")
 async def driver_ws(websocket: WebSocket, driver_id: int):
@@ -85,22 +265,43 @@ async def driver_ws(websocket: WebSocket, driver_id: int):
     try:
         while True:
             data = await websocket.receive_json()
-            db = SessionLocal()
-            driver = db.query(Driver).filter(Driver.id==int(driver_id)).first()
-            if driver:
-                driver.current_lat = data["lat"]
-                driver.current_lon = data["lon"]
-                db.commit()
-            db.close()
+            # just coalesce: the background flusher writes the batch
+            async with _pending_lock:
+                pending_locations[int(driver_id)] = (data["lat"], data["lon"])
+            await _broadcast_location(int(driver_id), data["lat"], data["lon"])
     except WebSocketDisconnect:
         del active_connections[driver_id]
 
+@app.websocket("/ws/patient/{driver_id}")
+async def patient_ws(websocket: WebSocket, driver_id: int):
+    # streams the driver's location to the patient, replacing HTTP polling
+    await websocket.accept()
+    patient_subscribers[driver_id].add(websocket)
+    def initial_pos():
+        db = SessionLocal()
+        try:
+            return db.execute(
+                select(Driver.current_lat, Driver.current_lon).where(Driver.id == driver_id)
+            ).first()
+        finally:
+            db.close()
+    # initial read happens off-loop; later frames arrive via broadcast
+    pos = await asyncio.to_thread(initial_pos)
+    if pos:
+        await websocket.send_json({"driver_id": driver_id, "lat": pos[0], "lon": pos[1]})
+    try:
+        while True:
+            await websocket.receive_text()  # client keepalives
+    except WebSocketDisconnect:
+        patient_subscribers[driver_id].discard(websocket)
+
 # ----------------- API Endpoints -----------------
 @app.post("/add_driver")
 def add_driver(name: str, phone: str, vehicle_number: str, db: Session = Depends(get_db)):
     driver = Driver(name=name, phone=phone, vehicle_number=vehicle_number)
     db.add(driver)
     db.commit()
+    driver_index.invalidate()
     return {"message": "Driver added", "driver_id": driver.id}
 
 @app.post("/add_user")
@@ -112,22 +313,42 @@ def add_user(name: str, phone: str, db: Session = Depends(get_db)):
 
 @app.post("/request_ambulance")
 def request_ambulance(user_id: int, lat: float, lon: float, emergency_type: str, db: Session = Depends(get_db)):
-    drivers = db.query(Driver).filter(Driver.is_available==True).all()
-    if not drivers:
-        return {"error": "No drivers available"}
-    nearest_driver = min(drivers, key=lambda d: haversine(lat, lon, d.current_lat, d.current_lon))
+    # k-NN query against the KD-tree; candidates are re-checked against the
+    # DB so a stale index just costs an extra lookup, never a wrong dispatch
+    nearest = None  # (id, name)
+    for did in driver_index.nearest(db, lat, lon, k=8):
+        row = db.execute(select(Driver.id, Driver.name).where(Driver.id==did, Driver.is_available.is_(True))).first()
+        if row:
+            nearest = row
+            break
+    if nearest is None:
+        # index empty or fully stale: fall back to the vectorized scan over
+        # a Core SELECT of plain tuples — no ORM hydration at all
+        rows = db.execute(select(Driver.id, Driver.name, Driver.current_lat, Driver.current_lon)
+                          .where(Driver.is_available.is_(True))).all()
+        if not rows:
+            return {"error": "No drivers available"}
+        lats = np.array([r[2] for r in rows], np.float64)
+        lons = np.array([r[3] for r in rows], np.float64)
+        if NUMBA_OK:
+            best = int(_nearest_idx(lat, lon, lats, lons))
+        else:
+            best = nearest_to(lat, lon, lats, lons)
+        nearest = (rows[best][0], rows[best][1])
     ambulance_request = AmbulanceRequest(
         user_id=user_id,
-        driver_id=nearest_driver.id,
+        driver_id=nearest[0],
         pickup_lat=lat,
         pickup_lon=lon,
         emergency_type=emergency_type,
         status="enroute"
     )
     db.add(ambulance_request)
-    nearest_driver.is_available = False
+    # targeted UPDATE instead of hydrating the row just to flip a flag
+    db.execute(update(Driver).where(Driver.id==nearest[0]).values(is_available=False))
     db.commit()
-    return {"message": "Ambulance dispatched", "driver": nearest_driver.name, "driver_id": nearest_driver.id,
+    driver_index.invalidate()
+    return {"message": "Ambulance dispatched", "driver": nearest[1], "driver_id": nearest[0],
             "pickup_lat": lat, "pickup_lon": lon}
 
 @app.get("/update_driver_location")
@@ -137,6 +358,9 @@ def update_driver_location(driver_id: int, lat: float, lon: float, db: Session =
         driver.current_lat = lat
         driver.current_lon = lon
         db.commit()
+        driver_index.invalidate()
+        if _loop is not None:
+            asyncio.run_coroutine_threadsafe(_broadcast_location(driver_id, lat, lon), _loop)
         return {"message": "Location updated"}
     return {"error": "Driver not found"}
 
@@ -153,31 +377,69 @@ server_thread.start()
 
 # ----------------- Tkinter GUI with Live Map -----------------
 API_URL = "http://127.0.0.1:8000"
-
+WS_URL = "ws://127.0.0.1:8000"
+# one shared session for the HTTP that remains, amortizing TCP setup
+http = requests.Session()
+# one shared asyncio loop in a background thread hosts every simulated
+# driver, instead of a blocking requests thread per driver
+_async_loop = asyncio.new_event_loop()
+threading.Thread(target=_async_loop.run_forever, daemon=True).start()
+
+# memoized on (rounded) coordinates: rebuilding and serializing a Folium
+# map is a multi-MB operation, so repeated ticks with an unmoved driver
+# cost a dict lookup instead of a full re-render
+@functools.lru_cache(maxsize=64)
 def generate_map(driver_lat, driver_lon, patient_lat, patient_lon):
     m = folium.Map(location=[(driver_lat+patient_lat)/2, (driver_lon+patient_lon)/2], zoom_start=14)
     folium.Marker([patient_lat, patient_lon], popup="Patient", icon=folium.Icon(color='red')).add_to(m)
-    folium.Marker([driver_lat, driver_lon], popup="Driver", icon=folium.Icon(color='blue')).add_to(m)
+    driver_marker = folium.Marker([driver_lat, driver_lon], popup="Driver", icon=folium.Icon(color='blue'))
+    driver_marker.add_to(m)
     data = io.BytesIO()
     m.save(data, close_file=False)
-    return data.getvalue().decode()
+    html = data.getvalue().decode()
+    # expose the driver marker to window scope so the browser widget can
+    # move it in place (update_driver) instead of swapping the document
+    script = ('<script>window.driverMarker = ' + driver_marker.get_name() + ';'
+              'window.update_driver = function(lat, lon) { window.driverMarker.setLatLng([lat, lon]); };'
+              '</script></body>')
+    return html.replace('</body>', script)
 
 def patient_map_gui(pickup_lat, pickup_lon, driver_id):
     map_window = tk.Toplevel()
     map_window.title("Live Map")
 
-    html_content = HTMLLabel(map_window, html=generate_map(23.8103, 90.4125, pickup_lat, pickup_lon))
-    html_content.pack(fill="both", expand=True)
+    # browser-backed widget: Leaflet boots once, later ticks are one JS
+    # call that moves the marker instead of re-parsing the whole document
+    frame = HtmlFrame(map_window, messages_enabled=False)
+    frame.load_html(generate_map(23.8103, 90.4125, pickup_lat, pickup_lon))
+    frame.pack(fill="both", expand=True)
+
+    last_pos = [None]
+    latest = {}
+
+    def listen():
+        # one long-lived socket streaming driver coords replaces an HTTP
+        # round trip (plus a DB read) per tick
+        try:
+            from websocket import create_connection
+            ws = create_connection(f"{WS_URL}/ws/patient/{driver_id}")
+            while True:
+                msg = json.loads(ws.recv())
+                latest['pos'] = (msg["lat"], msg["lon"])
+        except Exception:
+            pass
+
+    threading.Thread(target=listen, daemon=True).start()
 
     def update_map():
         try:
-            response = requests.get(f"{API_URL}/update_driver_location", params={"driver_id": driver_id, "lat": 23.8103, "lon": 90.4125})
-            # fetch updated driver location from DB
-            db = SessionLocal()
-            driver = db.query(Driver).filter(Driver.id==driver_id).first()
-            db.close()
-            if driver:
-                html_content.set_html(generate_map(driver.current_lat, driver.current_lon, pickup_lat, pickup_lon))
+            pos = latest.get('pos')
+            if pos:
+                # only touch the widget when the driver actually moved
+                key = (round(pos[0], 5), round(pos[1], 5))
+                if key != last_pos[0]:
+                    last_pos[0] = key
+                    frame.run_javascript(f"update_driver({key[0]}, {key[1]});")
         except:
             pass
         map_window.after(2000, update_map)
@@ -192,7 +454,7 @@ def request_ambulance_gui():
             lat = float(lat_entry.get())
             lon = float(lon_entry.get())
             emergency_type = emergency_entry.get()
-            response = requests.post(f"{API_URL}/request_ambulance",
+            response = http.post(f"{API_URL}/request_ambulance",
                                      params={"user_id": user_id, "lat": lat, "lon": lon, "emergency_type": emergency_type})
             data = response.json()
             if "error" in data:
@@ -229,21 +491,29 @@ def driver_gui():
     def start_tracking():
         try:
             driver_id = int(driver_id_entry.get())
-            def send_location():
-                lat = float(lat_entry.get())
-                lon = float(lon_entry.get())
-                while tracking[0]:
-                    requests.get(f"{API_URL}/update_driver_location",
-                                 params={"driver_id": driver_id, "lat": lat, "lon": lon})
-                    lat += 0.0005  # simulate movement
-                    lon += 0.0005
-                    lat_entry.delete(0, tk.END)
-                    lat_entry.insert(0, str(lat))
-                    lon_entry.delete(0, tk.END)
-                    lon_entry.insert(0, str(lon))
-                    time.sleep(2)
+            lat = float(lat_entry.get())
+            lon = float(lon_entry.get())
+
+            async def track(lat, lon):
+                import websockets
+                # one socket for the whole session; widget updates hop back
+                # to the Tk thread instead of being mutated from here
+                async with websockets.connect(f"{WS_URL}/ws/driver/{driver_id}", ping_interval=20) as ws:
+                    while tracking[0]:
+                        await ws.send(json.dumps({"lat": lat, "lon": lon}))
+                        lat += 0.0005  # simulate movement
+                        lon += 0.0005
+
+                        def show(la=lat, lo=lon):
+                            lat_entry.delete(0, tk.END)
+                            lat_entry.insert(0, str(la))
+                            lon_entry.delete(0, tk.END)
+                            lon_entry.insert(0, str(lo))
+                        driver_window.after(0, show)
+                        await asyncio.sleep(2)
+
             tracking[0] = True
-            threading.Thread(target=send_location, daemon=True).start()
+            asyncio.run_coroutine_threadsafe(track(lat, lon), _async_loop)
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
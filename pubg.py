@@ -3,6 +3,9 @@ from ursina import *
 from ursina.prefabs.first_person_controller import FirstPersonController
 import random
 import math
+from collections import defaultdict
+
+import numpy as np
 
 app = Ursina()
 
@@ -29,10 +32,11 @@ crosshair = Entity(model='quad', color=color.white, scale=.01, always_on_top=Tru
 
 # --- Weapon / shooting ---
 bullet_speed = 100
-bullets = []
+bullets = []        # active bullets only
+bullet_free = []    # disabled pool entries ready for reuse
 
 class Bullet(Entity):
-    def __init__(self, position, direction):
+    def __init__(self, position):
         super().__init__(
             model='sphere',
             scale=0.08,
@@ -41,12 +45,53 @@ class Bullet(Entity):
             collider='sphere',
             double_sided=True
         )
-        self.direction = direction.normalized()
-    def update(self):
-        self.position += self.direction * bullet_speed * time.dt
-        # despawn far away bullets
-        if distance(self.position, player.position) > 200:
-            destroy(self)
+        self.pool_idx = -1
+        self.active_idx = -1
+
+POOL_N = 128
+# SoA mirrors of the pool: motion and despawn run as array ops in the
+# global update() instead of a per-entity Bullet.update each frame
+bullet_pos = np.zeros((POOL_N, 3), np.float32)
+bullet_dir = np.zeros((POOL_N, 3), np.float32)
+bullet_live = np.zeros(POOL_N, bool)
+
+# fixed pool: firing re-enables a parked entity instead of paying
+# Entity.__init__ + destroy per shot
+BULLET_POOL = [Bullet(position=Vec3(0,-999,0)) for _ in range(POOL_N)]
+for _i, _b in enumerate(BULLET_POOL):
+    _b.enabled = False
+    _b.pool_idx = _i
+bullet_free.extend(BULLET_POOL)
+
+def fire_bullet(origin, direction):
+    if not bullet_free:
+        return None  # pool exhausted, drop the shot
+    b = bullet_free.pop()
+    i = b.pool_idx
+    d = direction.normalized()
+    bullet_pos[i] = (origin.x, origin.y, origin.z)
+    bullet_dir[i] = (d.x, d.y, d.z)
+    bullet_live[i] = True
+    b.position = origin
+    b.enabled = True
+    b.active_idx = len(bullets)
+    bullets.append(b)
+    return b
+
+def free_bullet(b):
+    # O(1) removal: swap with the last active bullet and pop
+    if not b.enabled:
+        return
+    b.enabled = False
+    bullet_live[b.pool_idx] = False
+    b.position = Vec3(0,-999,0)
+    k = b.active_idx
+    last = bullets[-1]
+    bullets[k] = last
+    last.active_idx = k
+    bullets.pop()
+    b.active_idx = -1
+    bullet_free.append(b)
 
 # --- Enemies ---
 enemies = []
@@ -79,6 +124,11 @@ for _ in range(6):
 def distance(a,b):
     return math.sqrt((a.x-b.x)**2 + (a.y-b.y)**2 + (a.z-b.z)**2)
 
+def dist_sq(a,b):
+    # squared distance for threshold checks — skips the sqrt
+    dx, dy, dz = a.x-b.x, a.y-b.y, a.z-b.z
+    return dx*dx + dy*dy + dz*dz
+
 # --- Shoot handling ---
 def input(key):
     if key == 'left mouse down':
@@ -87,9 +137,7 @@ def input(key):
             ammo_text.text = f'{player.weapon} Ammo: {player.ammo}'
             # spawn bullet from camera
             origin = camera.world_position + camera.forward * 1.2
-            dir = camera.forward
-            b = Bullet(position=origin, direction=dir)
-            bullets.append(b)
+            fire_bullet(origin, camera.forward)
         else:
             # click - empty
             pass
@@ -101,38 +149,90 @@ def input(key):
 def update():
     # update HUD health
     health_text.text = f'HP: {player.health}'
-    # bullets collision vs enemies
+
+    # advance every live bullet in one vectorized step, despawn the far
+    # ones with a mask, and sync entity positions for rendering/collision
+    if bullets:
+        live = bullet_live
+        bullet_pos[live] += bullet_dir[live] * (bullet_speed * time.dt)
+        ppos = np.array((player.x, player.y, player.z), np.float32)
+        d = bullet_pos[live] - ppos
+        far_idx = np.nonzero(live)[0][(d*d).sum(1) > 200*200]
+        for b in bullets:
+            p = bullet_pos[b.pool_idx]
+            b.position = Vec3(float(p[0]), float(p[1]), float(p[2]))
+        for i in far_idx:
+            free_bullet(BULLET_POOL[int(i)])
+
+    # x-axis sweep-and-prune ahead of the grid: sort enemy x once, then a
+    # bullet whose x-window contains no enemy never builds its cell walk
+    hit_r = 2.0
+    near_x = frozenset()
+    if bullets and enemies:
+        ex = np.sort(np.array([e.x for e in enemies], np.float32))
+        li = np.nonzero(bullet_live)[0]
+        bx = bullet_pos[li, 0]
+        lo = np.searchsorted(ex, bx - hit_r)
+        hi = np.searchsorted(ex, bx + hit_r)
+        near_x = frozenset(li[lo < hi].tolist())
+
+    # bullets collision vs enemies: uniform-grid broad phase so each bullet
+    # only tests enemies in its own and neighboring cells instead of B*E pairs
+    cell = 4.0
+    enemy_grid = defaultdict(list)
+    for e in enemies:
+        enemy_grid[(int(e.x // cell), int(e.z // cell))].append(e)
     for b in bullets[:]:
-        for e in enemies[:]:
-            if b.intersects(e).hit:
-                e.health -= 20
-                try:
-                    destroy(b)
-                    bullets.remove(b)
-                except:
-                    pass
-                if e.health <= 0:
-                    # create ragdoll-ish effect and remove
-                    explosion = Entity(model='sphere', color=color.orange, scale=2, position=e.position, lifespan=0.35)
-                    enemies.remove(e)
-                    destroy(e)
-                    # spawn another enemy after delay
-                    invoke(spawn_enemy, delay=2)
+        if not b.enabled or b.pool_idx not in near_x:
+            continue
+        cx, cz = int(b.x // cell), int(b.z // cell)
+        hit = False
+        for gx in (cx-1, cx, cx+1):
+            for gz in (cz-1, cz, cz+1):
+                for e in enemy_grid.get((gx, gz), ()):
+                    if e.health <= 0:
+                        continue
+                    dx, dz = b.x - e.x, b.z - e.z
+                    # cheap squared-distance reject before the collider test
+                    if dx*dx + dz*dz > 4.0 or not b.intersects(e).hit:
+                        continue
+                    e.health -= 20
+                    free_bullet(b)
+                    if e.health <= 0:
+                        # create ragdoll-ish effect and remove
+                        explosion = Entity(model='sphere', color=color.orange, scale=2, position=e.position, lifespan=0.35)
+                        enemies.remove(e)
+                        destroy(e)
+                        # spawn another enemy after delay
+                        invoke(spawn_enemy, delay=2)
+                    hit = True
+                    break
+                if hit:
+                    break
+            if hit:
                 break
 
-    # simple enemy AI: wander + chase if close
-    for e in enemies:
-        d = distance(e.position, player.position)
-        if d < 12:
-            # chase
-            dir = (player.position - e.position).normalized()
-            e.position += dir * e.walk_speed * time.dt
-        else:
-            # wander randomly
-            if not hasattr(e, 'target') or distance(e.position, e.target) < 1:
+    # simple enemy AI: wander + chase if close. Positions/targets/speeds are
+    # gathered into SoA arrays and every movement vector is advanced in a
+    # few NumPy ops; entities only get written back for rendering
+    if enemies:
+        ppos = np.array((player.x, player.y, player.z), np.float32)
+        pos = np.array([(e.x, e.y, e.z) for e in enemies], np.float32)
+        delta = ppos - pos
+        chase = (delta*delta).sum(1) < 144
+        # reroll finished wander targets (rare, stays in Python)
+        for i, e in enumerate(enemies):
+            if not chase[i] and (not hasattr(e, 'target') or dist_sq(e.position, e.target) < 1):
                 e.target = Vec3(random.uniform(-40,40),1, random.uniform(-40,40))
-            dir = (e.target - e.position).normalized()
-            e.position += dir * (e.walk_speed * 0.6) * time.dt
+        tgt = np.array([(e.target.x, e.target.y, e.target.z) if hasattr(e, 'target') else (e.x, e.y, e.z)
+                        for e in enemies], np.float32)
+        speed = np.array([e.walk_speed for e in enemies], np.float32)
+        step = np.where(chase[:, None], delta, tgt - pos)
+        inv = 1.0 / np.sqrt(np.maximum((step*step).sum(1), 1e-9))
+        vel = speed * np.where(chase, 1.0, 0.6) * time.dt
+        pos += step * (inv * vel)[:, None]
+        for e, p in zip(enemies, pos):
+            e.position = Vec3(float(p[0]), float(p[1]), float(p[2]))
 
     # pickups
     for p in pickups[:]:
@@ -146,7 +246,7 @@ def update():
 
     # player hit if enemy too close (simple)
     for e in enemies:
-        if distance(e.position, player.position) < 1.5:
+        if dist_sq(e.position, player.position) < 2.25:
             player.health -= 20 * time.dt  # continuous damage
             if player.health <= 0:
                 # respawn
@@ -2,12 +2,23 @@ import tkinter as tk
 from tkinter import messagebox
 
 class TicTacToe:
+    # win masks (bit i = cell i), precomputed once instead of rebuilding a
+    # list of index triples on every check
+    WINS = (
+        0b000000111, 0b000111000, 0b111000000,  # rows
+        0b001001001, 0b010010010, 0b100100100,  # cols
+        0b100010001, 0b001010100                # diagonals
+    )
+
     def __init__(self, root):
         self.root = root
         self.root.title("Tic Tac Toe - Modern Edition")
         self.root.configure(bg="#2c3e50")
         self.current_player = "X"
-        self.board = [""] * 9
+        # the whole board state is these two occupancy bitmasks: bit i set
+        # means player owns cell i, and a win is one AND per pattern
+        self.x_bits = 0
+        self.o_bits = 0
         self.buttons = []
 
         self.status_label = tk.Label(
@@ -51,14 +62,17 @@ class TicTacToe:
         reset_btn.pack(pady=15)
 
     def on_click(self, index):
-        if self.board[index] == "" and not self.check_winner():
-            self.board[index] = self.current_player
+        if not ((self.x_bits | self.o_bits) >> index & 1) and not self.check_winner():
+            if self.current_player == "X":
+                self.x_bits |= 1 << index
+            else:
+                self.o_bits |= 1 << index
             self.buttons[index].config(text=self.current_player)
 
             if self.check_winner():
                 self.status_label.config(text=f"🎉 Player {self.current_player} Wins!", fg="#f1c40f")
                 messagebox.showinfo("Game Over", f"Player {self.current_player} Wins!")
-            elif "" not in self.board:
+            elif (self.x_bits | self.o_bits) == 0x1FF:
                 self.status_label.config(text="🤝 It's a Draw!", fg="#f39c12")
                 messagebox.showinfo("Game Over", "It's a Draw!")
             else:
@@ -66,22 +80,19 @@ class TicTacToe:
                 self.status_label.config(text=f"Player {self.current_player}'s Turn")
 
     def check_winner(self):
-        win_patterns = [
-            [0,1,2], [3,4,5], [6,7,8], # rows
-            [0,3,6], [1,4,7], [2,5,8], # cols
-            [0,4,8], [2,4,6]           # diagonals
-        ]
-        for pattern in win_patterns:
-            a, b, c = pattern
-            if self.board[a] == self.board[b] == self.board[c] != "":
-                for i in pattern:
-                    self.buttons[i].config(bg="#27ae60")  # highlight win
-                return True
+        for bits in (self.x_bits, self.o_bits):
+            for mask in self.WINS:
+                if bits & mask == mask:
+                    for i in range(9):
+                        if mask >> i & 1:
+                            self.buttons[i].config(bg="#27ae60")  # highlight win
+                    return True
         return False
 
     def reset_game(self):
         self.current_player = "X"
-        self.board = [""] * 9
+        self.x_bits = 0
+        self.o_bits = 0
         for btn in self.buttons:
             btn.config(text="", bg="#34495e")
         self.status_label.config(text=f"Player {self.current_player}'s Turn", fg="white")